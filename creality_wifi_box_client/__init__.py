@@ -1,21 +1,52 @@
 """Init file for the creality wifi box client."""
 
+from .actuation import Actuation, ConfirmPolicy
 from .box_info import BoxInfo
 from .creality_wifi_box_client import CrealityWifiBoxClient
 from .exceptions import (
     ClientConnectionError,
     CommandError,
+    ConfirmationTimeoutError,
     CrealityWifiBoxError,
     InvalidResponseError,
     RequestTimeoutError,
 )
+from .hedging import HedgeBudget, HedgePolicy, HedgeStats, RetryPolicy
+from .position import MotionSample, MotionTrace, MotionTraceStore, Position, parse_position
+from .recording import Exchange, Recorder, ReplayServer, load_recording
+from .scheduler import PollScheduler, SchedulerStats
+from .snapshot import FleetSnapshot, KnownState, revalidation_delays
+from .upload import UploadOptions, upload_to_many
 
 __all__ = [
+    "Actuation",
     "BoxInfo",
     "ClientConnectionError",
     "CommandError",
+    "ConfirmPolicy",
+    "ConfirmationTimeoutError",
     "CrealityWifiBoxClient",
     "CrealityWifiBoxError",
+    "Exchange",
+    "FleetSnapshot",
+    "HedgeBudget",
+    "HedgePolicy",
+    "HedgeStats",
     "InvalidResponseError",
+    "KnownState",
+    "MotionSample",
+    "MotionTrace",
+    "MotionTraceStore",
+    "PollScheduler",
+    "Position",
+    "Recorder",
+    "ReplayServer",
     "RequestTimeoutError",
+    "RetryPolicy",
+    "SchedulerStats",
+    "UploadOptions",
+    "load_recording",
+    "parse_position",
+    "revalidation_delays",
+    "upload_to_many",
 ]
@@ -0,0 +1,7 @@
+"""Command line entry point for the creality wifi box client."""
+
+import sys
+
+from .monitor import main
+
+sys.exit(main())
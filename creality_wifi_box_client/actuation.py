@@ -0,0 +1,102 @@
+"""Confirmation that a command took effect on the printer."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from .box_info import BoxInfo
+from .exceptions import CrealityWifiBoxError
+
+Effect = Callable[[BoxInfo], bool]
+
+# Print states reported by the printer in BoxInfo.state. Unlike the pause and
+# stop flags, which the box sets as soon as it accepts a command, these only
+# change once the printer itself has acted on it.
+STATE_IDLE = 0
+STATE_PRINTING = 1
+STATE_STOPPED = 4
+STATE_PAUSED = 5
+
+
+@dataclass(frozen=True)
+class Actuation:
+    """
+    Timing of a confirmed command.
+
+    ``time_to_ack`` is the time until the box accepted the command and
+    ``time_to_effect`` the time until a snapshot showed the printer in the
+    expected state, both in seconds from when the command was sent.
+    ``time_to_effect`` is None if the effect was not seen before the deadline.
+    """
+
+    command: str
+    time_to_ack: float
+    time_to_effect: float | None
+    polls: int
+
+
+@dataclass(frozen=True)
+class ConfirmPolicy:
+    """
+    Configuration for confirming commands.
+
+    Snapshots are polled first after ``initial_interval`` and then at
+    intervals that halve down to ``min_interval``, since the printer usually
+    needs to finish its current move before a command shows any effect.
+    """
+
+    timeout: float = 10.0
+    initial_interval: float = 0.4
+    min_interval: float = 0.05
+
+
+def is_paused(info: BoxInfo) -> bool:
+    """Check whether the printer reports the print as paused."""
+    return info.state == STATE_PAUSED
+
+
+def is_resumed(info: BoxInfo) -> bool:
+    """Check whether the printer reports the print as running again."""
+    return info.state == STATE_PRINTING and bool(info.mcu_is_print)
+
+
+def is_stopped(info: BoxInfo) -> bool:
+    """Check whether the printer reports the print as ended."""
+    return info.state in {STATE_IDLE, STATE_STOPPED} and not info.mcu_is_print
+
+
+async def await_effect(
+    get_info: Callable[[], Awaitable[BoxInfo]],
+    effect: Effect,
+    deadline: float,
+    policy: ConfirmPolicy,
+) -> tuple[float | None, int]:
+    """
+    Poll snapshots until the effect is seen or the deadline passes.
+
+    Errors while polling are ignored, the next poll may succeed.
+
+    Args:
+        get_info: Fetches a snapshot of the box
+        effect: Checks whether a snapshot shows the expected state
+        deadline: Monotonic time at which to give up
+        policy: Poll intervals
+
+    Returns:
+        The monotonic time the effect was seen, or None, and the number of polls
+
+    """
+    interval = policy.initial_interval
+    polls = 0
+    while (remaining := deadline - time.monotonic()) > 0:
+        await asyncio.sleep(min(interval, remaining))
+        interval = max(policy.min_interval, interval / 2)
+        polls += 1
+        try:
+            info = await get_info()
+        except CrealityWifiBoxError:
+            continue
+        if effect(info):
+            return time.monotonic(), polls
+    return None, polls
@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, Field, field_validator
 
+from .position import Position, parse_position
+
 
 class BoxInfo(BaseModel):
     """The class to hold the box information."""
@@ -80,3 +82,8 @@ class BoxInfo(BaseModel):
         if v == "":
             return 0
         return int(v)
+
+    @property
+    def position(self) -> Position | None:
+        """Get the parsed toolhead position, or None if it cannot be parsed."""
+        return parse_position(self.cur_position)
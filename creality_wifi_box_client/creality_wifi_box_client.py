@@ -1,18 +1,29 @@
 """Api for the creality wifi box."""
 
+import asyncio
 import json
+import time
+from pathlib import Path
 from types import TracebackType
-from typing import Self
+from typing import TYPE_CHECKING, Self
+from urllib.parse import quote
 
 import aiohttp
 
+from .actuation import Actuation, ConfirmPolicy, Effect, await_effect, is_paused, is_resumed, is_stopped
 from .box_info import BoxInfo
 from .exceptions import (
     ClientConnectionError,
     CommandError,
+    ConfirmationTimeoutError,
     InvalidResponseError,
     RequestTimeoutError,
 )
+from .hedging import HedgePolicy, HedgeStats, LatencyTracker, RetryPolicy
+from .upload import ChunkReader, ProgressCallback, UploadOptions
+
+if TYPE_CHECKING:
+    from .recording import Recorder
 
 
 class CrealityWifiBoxClient:
@@ -33,7 +44,11 @@ class CrealityWifiBoxClient:
         self,
         box_ip: str,
         box_port: int,
-        timeout: int = 30,
+        timeout: float = 30,
+        *,
+        hedging: HedgePolicy | None = None,
+        retry: RetryPolicy | None = None,
+        recorder: "Recorder | None" = None,
     ) -> None:
         """
         Initialize the CrealityWifiBoxClient with the base URL.
@@ -42,11 +57,20 @@ class CrealityWifiBoxClient:
             box_ip: IP address of the WiFi Box
             box_port: Port number of the WiFi Box
             timeout: Request timeout in seconds (default: 30)
+            hedging: Hedge slow get_info requests (default: disabled)
+            retry: Retry failed get_info requests (default: disabled)
+            recorder: Record every request and response (default: disabled)
 
         """
         self.base_url = f"http://{box_ip}:{box_port}/protocal.csp"
+        self.upload_url = f"http://{box_ip}:{box_port}/upload"
         self._session: aiohttp.ClientSession | None = None
         self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._hedging = hedging
+        self._retry = retry
+        self._latency = LatencyTracker(hedging.window, hedging.min_samples) if hedging else None
+        self.hedge_stats = HedgeStats()
+        self._recorder = recorder
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create an aiohttp session."""
@@ -78,6 +102,9 @@ class CrealityWifiBoxClient:
         """
         Send a GET request to retrieve device information.
 
+        The request is hedged and retried if the client was created with a
+        hedging or retry policy.
+
         Returns:
             BoxInfo object containing all device information
 
@@ -87,14 +114,70 @@ class CrealityWifiBoxClient:
             InvalidResponseError: If the response is invalid or malformed
 
         """
+        attempt = 0
+        while True:
+            try:
+                return await self._get_info_hedged()
+            except (ClientConnectionError, RequestTimeoutError):
+                if self._retry is None or attempt >= self._retry.retries:
+                    raise
+                await asyncio.sleep(self._retry.delay(attempt))
+                attempt += 1
+                self.hedge_stats.retries += 1
+
+    async def _get_info_hedged(self) -> BoxInfo:
+        """Fetch the device information, hedging if the first request is slow."""
+        if self._hedging is None or self._latency is None:
+            return await self._fetch_info()
+
+        self._hedging.budget.deposit()
+        hedge_delay = self._latency.percentile(self._hedging.percentile)
+        start = time.monotonic()
+        primary = asyncio.ensure_future(self._timed_fetch_info())
+        pending = {primary}
+        try:
+            if hedge_delay is None:
+                return await primary
+            done, _ = await asyncio.wait(pending, timeout=max(hedge_delay, self._hedging.min_delay))
+            if done or not self._hedging.budget.try_acquire():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._timed_fetch_info())
+            pending.add(hedge)
+            self.hedge_stats.hedges_sent += 1
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_stats.hedges_won += 1
+                        if task is hedge and not primary.done():
+                            # The abandoned request took at least this long.
+                            # Leaving it out would pull the learned percentile
+                            # towards the fast answers.
+                            self._latency.record(time.monotonic() - start)
+                        return task.result()
+            # Both requests failed, report the error of the original one.
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed_fetch_info(self) -> BoxInfo:
+        """Fetch the device information and record the request latency."""
+        start = time.monotonic()
+        info = await self._fetch_info()
+        if self._latency is not None:
+            self._latency.record(time.monotonic() - start)
+        return info
+
+    async def _fetch_info(self) -> BoxInfo:
+        """Send a single request for the device information."""
         url = f"{self.base_url}?fname=Info&opt=main&function=get"
         try:
-            session = await self._get_session()
-            async with session.get(url) as response:
-                response.raise_for_status()
-                response_text = await response.text()
-                return BoxInfo.model_validate(json.loads(response_text))
-        except aiohttp.ServerTimeoutError as e:
+            response_text = await self._request(url)
+            return BoxInfo.model_validate(json.loads(response_text))
+        except TimeoutError as e:
             msg = "Request to WiFi Box timed out"
             raise RequestTimeoutError(msg) from e
         except aiohttp.ClientConnectionError as e:
@@ -107,53 +190,201 @@ class CrealityWifiBoxClient:
             msg = f"HTTP error from WiFi Box: {e.status} {e.message}"
             raise ClientConnectionError(msg) from e
 
-    async def pause_print(self) -> bool:
+    async def _request(self, url: str) -> str:
+        """Send a GET request and return the response body."""
+        session = await self._get_session()
+        start = time.monotonic()
+        async with session.get(url) as response:
+            response_text = await response.text()
+            if self._recorder is not None:
+                self._recorder.record(url, response.status, response_text, time.monotonic() - start)
+            response.raise_for_status()
+            return response_text
+
+    async def pause_print(self, *, confirm: ConfirmPolicy | None = None) -> bool | Actuation:
         """
         Pause the current print job.
 
+        Args:
+            confirm: Wait until the printer shows the effect (default: only
+                wait until the box accepts the command)
+
         Returns:
-            True if successful, False otherwise
+            True if successful, or the timings of the command when confirmed
 
         Raises:
             ClientConnectionError: If connection to the box fails
             RequestTimeoutError: If the request times out
             CommandError: If the command fails
+            ConfirmationTimeoutError: If the effect was not seen in time
 
         """
         url = f"{self.base_url}?fname=net&opt=iot_conf&function=set&pause=1"
-        return await self._send_command(url, "pause print")
+        return await self._actuate(url, "pause print", is_paused, confirm)
 
-    async def resume_print(self) -> bool:
+    async def resume_print(self, *, confirm: ConfirmPolicy | None = None) -> bool | Actuation:
         """
         Resume the current print job.
 
+        Args:
+            confirm: Wait until the printer shows the effect (default: only
+                wait until the box accepts the command)
+
         Returns:
-            True if successful, False otherwise
+            True if successful, or the timings of the command when confirmed
 
         Raises:
             ClientConnectionError: If connection to the box fails
             RequestTimeoutError: If the request times out
             CommandError: If the command fails
+            ConfirmationTimeoutError: If the effect was not seen in time
 
         """
         url = f"{self.base_url}?fname=net&opt=iot_conf&function=set&pause=0"
-        return await self._send_command(url, "resume print")
+        return await self._actuate(url, "resume print", is_resumed, confirm)
 
-    async def stop_print(self) -> bool:
+    async def stop_print(self, *, confirm: ConfirmPolicy | None = None) -> bool | Actuation:
         """
         Stop the current print job.
 
+        Args:
+            confirm: Wait until the printer shows the effect (default: only
+                wait until the box accepts the command)
+
         Returns:
-            True if successful, False otherwise
+            True if successful, or the timings of the command when confirmed
 
         Raises:
             ClientConnectionError: If connection to the box fails
             RequestTimeoutError: If the request times out
             CommandError: If the command fails
+            ConfirmationTimeoutError: If the effect was not seen in time
 
         """
         url = f"{self.base_url}?fname=net&opt=iot_conf&function=set&stop=1"
-        return await self._send_command(url, "stop print")
+        return await self._actuate(url, "stop print", is_stopped, confirm)
+
+    async def _actuate(
+        self,
+        url: str,
+        command_name: str,
+        effect: Effect,
+        confirm: ConfirmPolicy | None,
+    ) -> bool | Actuation:
+        """
+        Send a command and optionally wait until it takes effect.
+
+        Args:
+            url: Full URL for the command
+            command_name: Human-readable command name for error messages
+            effect: Checks whether a snapshot shows the command took effect
+            confirm: Confirmation policy, or None to return once accepted
+
+        Returns:
+            True if successful, or the timings of the command when confirmed
+
+        Raises:
+            ClientConnectionError: If connection to the box fails
+            RequestTimeoutError: If the request times out
+            CommandError: If the command fails
+            ConfirmationTimeoutError: If the effect was not seen in time, with
+                the timings in its ``actuation``
+
+        """
+        start = time.monotonic()
+        success = await self._send_command(url, command_name)
+        if confirm is None:
+            return success
+
+        acked = time.monotonic()
+        seen, polls = await await_effect(self.get_info, effect, acked + confirm.timeout, confirm)
+        actuation = Actuation(
+            command_name,
+            time_to_ack=acked - start,
+            time_to_effect=None if seen is None else seen - start,
+            polls=polls,
+        )
+        if seen is None:
+            msg = f"Command '{command_name}' was not confirmed within {confirm.timeout}s"
+            raise ConfirmationTimeoutError(msg, actuation)
+        return actuation
+
+    async def upload_file(
+        self,
+        path: str | Path,
+        *,
+        remote_name: str | None = None,
+        progress: ProgressCallback | None = None,
+        options: UploadOptions | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> bool:
+        """
+        Upload a file, such as G-code, to the TF card of the box.
+
+        The file is streamed from disk in chunks. A dropped or timed out
+        transfer is restarted from the beginning while retries remain, an
+        error status from the box is raised right away.
+
+        Args:
+            path: File to upload
+            remote_name: Name of the file on the TF card (default: local name)
+            progress: Called with (bytes sent, total bytes) after each chunk
+            options: Chunk size and bandwidth cap
+            retry: Retry failed uploads (default: disabled)
+
+        Returns:
+            True if successful
+
+        Raises:
+            ClientConnectionError: If connection to the box fails
+            RequestTimeoutError: If the box stops responding
+            OSError: If the file cannot be read
+
+        """
+        path = Path(path)
+        url = f"{self.upload_url}/{quote(remote_name or path.name)}"
+        attempt = 0
+        try:
+            while True:
+                try:
+                    return await self._upload_once(url, path, progress, options or UploadOptions())
+                except aiohttp.ClientConnectionError:
+                    # Covers dropped connections and timeouts, an error status
+                    # from the box would only repeat.
+                    if retry is None or attempt >= retry.retries:
+                        raise
+                    await asyncio.sleep(retry.delay(attempt))
+                    attempt += 1
+        except aiohttp.ServerTimeoutError as e:
+            msg = "Upload to WiFi Box timed out"
+            raise RequestTimeoutError(msg) from e
+        except aiohttp.ClientConnectionError as e:
+            msg = f"Failed to connect to WiFi Box: {e}"
+            raise ClientConnectionError(msg) from e
+        except aiohttp.ClientResponseError as e:
+            msg = f"HTTP error for upload: {e.status} {e.message}"
+            raise ClientConnectionError(msg) from e
+
+    async def _upload_once(
+        self,
+        url: str,
+        path: Path,
+        progress: ProgressCallback | None,
+        options: UploadOptions,
+    ) -> bool:
+        """Stream a file to the box in a single request."""
+        reader = ChunkReader(path, options, progress)
+        # The transfer may take much longer than a normal request, only a
+        # box that stops reading counts as a timeout.
+        timeout = aiohttp.ClientTimeout(sock_read=self._timeout.total, sock_connect=self._timeout.total)
+        headers = {"Content-Length": str(reader.size), "Content-Type": "application/octet-stream"}
+        try:
+            session = await self._get_session()
+            async with session.post(url, data=reader, headers=headers, timeout=timeout) as response:
+                response.raise_for_status()
+                return True
+        finally:
+            reader.close()
 
     async def _send_command(self, url: str, command_name: str) -> bool:
         """
@@ -173,16 +404,9 @@ class CrealityWifiBoxClient:
 
         """
         try:
-            session = await self._get_session()
-            async with session.get(url) as response:
-                response.raise_for_status()
-                response_text = await response.text()
-                success = self.error_message_to_success(response_text)
-                if not success:
-                    msg = f"Command '{command_name}' failed"
-                    raise CommandError(msg)
-                return success
-        except aiohttp.ServerTimeoutError as e:
+            response_text = await self._request(url)
+            success = self.error_message_to_success(response_text)
+        except TimeoutError as e:
             msg = f"Command '{command_name}' timed out"
             raise RequestTimeoutError(msg) from e
         except aiohttp.ClientConnectionError as e:
@@ -194,6 +418,10 @@ class CrealityWifiBoxClient:
         except (json.JSONDecodeError, ValueError) as e:
             msg = f"Invalid response for '{command_name}': {e}"
             raise InvalidResponseError(msg) from e
+        if not success:
+            msg = f"Command '{command_name}' failed"
+            raise CommandError(msg)
+        return success
 
     def error_message_to_success(self, json_string: str) -> bool:
         """
@@ -1,5 +1,10 @@
 """Custom exceptions for the Creality WiFi Box client."""
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .actuation import Actuation
+
 
 class CrealityWifiBoxError(Exception):
     """Base exception for Creality WiFi Box errors."""
@@ -19,3 +24,12 @@ class InvalidResponseError(CrealityWifiBoxError):
 
 class CommandError(CrealityWifiBoxError):
     """Raised when a command fails on the box."""
+
+
+class ConfirmationTimeoutError(CommandError):
+    """Raised when a command was accepted but its effect was not seen in time."""
+
+    def __init__(self, message: str, actuation: "Actuation | None" = None) -> None:
+        """Initialize the error with the timings of the unconfirmed command."""
+        super().__init__(message)
+        self.actuation = actuation
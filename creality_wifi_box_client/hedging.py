@@ -0,0 +1,136 @@
+"""Hedging and retry policies for idempotent reads from the wifi box."""
+
+import random
+from collections import deque
+from dataclasses import dataclass
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies for a single box."""
+
+    def __init__(self, window: int = 100, min_samples: int = 20) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent latencies to keep
+            min_samples: Samples required before a percentile is reported
+
+        """
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+
+    def __len__(self) -> int:
+        """Return the number of recorded samples."""
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a successful request in seconds."""
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """
+        Get a latency percentile over the current window.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            The latency in seconds, or None if too few samples were recorded
+
+        """
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting how many hedged requests may be sent.
+
+    Every primary request earns ``ratio`` tokens, up to ``max_tokens``, and
+    every hedge spends one. Sharing one budget between clients caps the extra
+    load hedging adds to the whole fleet.
+    """
+
+    def __init__(self, ratio: float = 0.05, max_tokens: float = 10.0) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            ratio: Hedges allowed per primary request (default: 5%)
+            max_tokens: Maximum number of hedges that can be saved up
+
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of hedges currently available."""
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Credit the budget for a primary request."""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """Spend one token for a hedge if the budget allows it."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+DEFAULT_HEDGE_BUDGET = HedgeBudget()
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Configuration for hedging ``get_info`` requests.
+
+    A second request is sent once the first has been outstanding longer than
+    ``percentile`` of the recent latencies to the same box, and the first
+    answer wins.
+    """
+
+    percentile: float = 95.0
+    budget: HedgeBudget = DEFAULT_HEDGE_BUDGET
+    window: int = 100
+    min_samples: int = 20
+    min_delay: float = 0.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Configuration for retrying idempotent reads with jittered backoff."""
+
+    retries: int = 2
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before a retry using full jitter.
+
+        Args:
+            attempt: Zero based number of the retry
+
+        Returns:
+            Delay in seconds
+
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+@dataclass
+class HedgeStats:
+    """Counters for hedged and retried requests."""
+
+    hedges_sent: int = 0
+    hedges_won: int = 0
+    retries: int = 0
@@ -0,0 +1,362 @@
+"""Live monitor for a fleet of wifi boxes."""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+from .box_info import BoxInfo
+from .creality_wifi_box_client import CrealityWifiBoxClient
+from .exceptions import CrealityWifiBoxError
+from .snapshot import FleetSnapshot, revalidation_delays
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8080
+
+COLUMNS: tuple[tuple[str, int], ...] = (
+    ("Box", 21),
+    ("State", 16),
+    ("Progress", 8),
+    ("Nozzle", 6),
+    ("Bed", 5),
+    ("Layer", 11),
+    ("Error", 40),
+)
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+
+@dataclass(frozen=True)
+class PollResult:
+    """The outcome of polling one box."""
+
+    box: str
+    info: BoxInfo | None
+    error: str | None
+    timestamp: float
+    stale: bool = False
+
+
+def parse_box(spec: str) -> tuple[str, int]:
+    """
+    Parse a box given as HOST or HOST:PORT.
+
+    Raises:
+        argparse.ArgumentTypeError: If the port is not a number
+
+    """
+    host, _, port = spec.rpartition(":")
+    if not host:
+        return spec, DEFAULT_PORT
+    if not port.isdigit():
+        msg = f"invalid box address: {spec}"
+        raise argparse.ArgumentTypeError(msg)
+    return host, int(port)
+
+
+def describe_state(info: BoxInfo) -> str:
+    """Describe what the printer is doing."""
+    if info.stop:
+        return "stopped"
+    if info.pause:
+        return "paused"
+    if info.mcu_is_print:
+        return "printing"
+    return "idle"
+
+
+def result_cells(result: PollResult) -> list[str]:
+    """Get the table cells for a poll result."""
+    info = result.info
+    if info is None:
+        return [result.box, "offline", "", "", "", "", result.error or ""]
+    state = describe_state(info)
+    return [
+        result.box,
+        f"{state} (stale)" if result.stale else state,
+        f"{info.print_progress}%",
+        f"{info.nozzle_temp}°C",
+        f"{info.bed_temp}°C",
+        f"{info.layer}/{info.total_layer}",
+        f"err {info.err}" if info.err else "",
+    ]
+
+
+def result_record(result: PollResult) -> dict[str, object]:
+    """Get the JSON record for a poll result."""
+    record: dict[str, object] = {"box": result.box, "time": round(result.timestamp, 3), "stale": result.stale}
+    info = result.info
+    if info is None:
+        record["error"] = result.error
+        return record
+    record.update(
+        state=describe_state(info),
+        progress=info.print_progress,
+        nozzle_temp=info.nozzle_temp,
+        bed_temp=info.bed_temp,
+        layer=info.layer,
+        total_layer=info.total_layer,
+        err=info.err,
+    )
+    return record
+
+
+class TableRenderer:
+    """
+    Draw the fleet as a table, rewriting only the cells that changed.
+
+    Every box keeps the row it was first drawn on, so results can be rendered
+    for the whole fleet or for single boxes.
+    """
+
+    def __init__(self, out: TextIO) -> None:
+        """Initialize the renderer writing to a terminal."""
+        self._out = out
+        self._rows: dict[str, int] = {}
+        self._cells: dict[tuple[int, int], str] = {}
+        self._columns: list[int] = []
+        column = 1
+        for _, width in COLUMNS:
+            self._columns.append(column)
+            column += width + 1
+
+    def render(self, results: Sequence[PollResult]) -> None:
+        """Draw the poll results."""
+        parts: list[str] = []
+        if not self._rows:
+            header = " ".join(title.ljust(width) for title, width in COLUMNS)
+            parts.extend((CLEAR_SCREEN, header, "\n", "-" * len(header)))
+        for result in results:
+            row = self._rows.setdefault(result.box, len(self._rows) + 3)
+            for index, value in enumerate(result_cells(result)):
+                cell = value[: COLUMNS[index][1]].ljust(COLUMNS[index][1])
+                if self._cells.get((row, index)) != cell:
+                    self._cells[row, index] = cell
+                    parts.append(f"\x1b[{row};{self._columns[index]}H{cell}")
+        parts.append(f"\x1b[{len(self._rows) + 3};1H")
+        self._out.write("".join(parts))
+        self._out.flush()
+
+
+class JsonLinesRenderer:
+    """Write every poll result as one JSON line."""
+
+    def __init__(self, out: TextIO) -> None:
+        """Initialize the renderer."""
+        self._out = out
+
+    def render(self, results: Sequence[PollResult]) -> None:
+        """Write the poll results."""
+        self._out.writelines(json.dumps(result_record(result), separators=(",", ":")) + "\n" for result in results)
+        self._out.flush()
+
+
+class Profiler:
+    """Collect wall clock latency and CPU time for each phase of the monitor."""
+
+    def __init__(self) -> None:
+        """Initialize an empty profile."""
+        self._wall: defaultdict[str, list[float]] = defaultdict(list)
+        self._cpu: defaultdict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def measure(self, phase: str, *, cpu: bool = True) -> Iterator[None]:
+        """
+        Measure a phase.
+
+        Args:
+            phase: Name of the phase
+            cpu: Also measure process CPU time, only meaningful for phases
+                that do not overlap with other work
+
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self._wall[phase].append(time.perf_counter() - wall_start)
+            if cpu:
+                self._cpu[phase] += time.process_time() - cpu_start
+
+    def report(self) -> str:
+        """Summarize the profile as a table, times in milliseconds."""
+        lines = [f"{'phase':<10}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}{'cpu':>10}"]
+        for phase, samples in self._wall.items():
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            cpu = f"{self._cpu[phase] * 1000:.1f}" if phase in self._cpu else "-"
+            lines.append(
+                f"{phase:<10}{len(ordered):>8}{statistics.fmean(ordered) * 1000:>10.1f}"
+                f"{statistics.median(ordered) * 1000:>10.1f}{p95 * 1000:>10.1f}{ordered[-1] * 1000:>10.1f}{cpu:>10}"
+            )
+        lines.append(f"total cpu {time.process_time() * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+async def poll(client: CrealityWifiBoxClient, box: str, profiler: Profiler) -> PollResult:
+    """Poll one box, capturing any error."""
+    try:
+        with profiler.measure("request", cpu=False):
+            info = await client.get_info()
+    except CrealityWifiBoxError as e:
+        return PollResult(box, None, str(e), time.time())
+    return PollResult(box, info, None, time.time())
+
+
+@dataclass
+class Monitor:
+    """
+    Poll every box concurrently and render the results.
+
+    With a ``state_file``, the last known state of the fleet is loaded and
+    rendered as stale on start, then each box is revalidated in its own slot
+    of ``revalidate_window`` instead of all at once. The state is saved at
+    most every ``save_interval`` seconds and after the last sweep, rewriting a
+    large fleet after every sweep would cost more than the polls. A state file
+    that cannot be loaded is logged and replaced.
+    """
+
+    boxes: Sequence[tuple[str, int]]
+    render: Callable[[Sequence[PollResult]], None]
+    profiler: Profiler = field(default_factory=Profiler)
+    interval: float = 5.0
+    count: int | None = None
+    state_file: Path | None = None
+    revalidate_window: float = 0.0
+    timeout: float = 5.0
+    save_interval: float = 60.0
+    _saved_at: float = field(default=float("-inf"), init=False, repr=False)
+
+    async def run(self) -> None:
+        """Run the monitor for ``count`` sweeps, or forever."""
+        clients = {f"{host}:{port}": CrealityWifiBoxClient(host, port, self.timeout) for host, port in self.boxes}
+        snapshot = FleetSnapshot()
+        try:
+            sweep = 0
+            if self.state_file is not None:
+                snapshot = await self._load(self.state_file)
+                await self._warm_start(clients, snapshot)
+                sweep += 1
+            while self.count is None or sweep < self.count:
+                start = time.monotonic()
+                with self.profiler.measure("sweep"):
+                    results = await asyncio.gather(
+                        *(poll(client, box, self.profiler) for box, client in clients.items())
+                    )
+                with self.profiler.measure("render"):
+                    self.render(results)
+                sweep += 1
+                last = self.count is not None and sweep >= self.count
+                await self._save(snapshot, results, force=last)
+                if not last:
+                    await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+        finally:
+            await asyncio.gather(*(client.close() for client in clients.values()))
+
+    async def _load(self, state_file: Path) -> FleetSnapshot:
+        """Load the state file, or start empty if it is corrupt or outdated."""
+        try:
+            return await asyncio.to_thread(FleetSnapshot.load, state_file)
+        except (OSError, EOFError, ValueError) as e:
+            _LOGGER.warning("Ignoring state file %s: %s", state_file, e)
+            return FleetSnapshot()
+
+    async def _warm_start(self, clients: dict[str, CrealityWifiBoxClient], snapshot: FleetSnapshot) -> None:
+        """Render the stale fleet, then revalidate it spread over the window."""
+        stale = [
+            PollResult(box, state.info, None, state.timestamp, stale=True)
+            for box in clients
+            if (state := snapshot.get(box)) is not None
+        ]
+        with self.profiler.measure("render"):
+            self.render(stale)
+
+        async def revalidate(box: str, delay: float) -> PollResult:
+            await asyncio.sleep(delay)
+            result = await poll(clients[box], box, self.profiler)
+            with self.profiler.measure("render"):
+                self.render([result])
+            return result
+
+        delays = revalidation_delays(snapshot, list(clients), self.revalidate_window)
+        with self.profiler.measure("revalidate", cpu=False):
+            results = await asyncio.gather(*(revalidate(box, delay) for box, delay in delays.items()))
+        await self._save(snapshot, results)
+
+    async def _save(self, snapshot: FleetSnapshot, results: Sequence[PollResult], *, force: bool = False) -> None:
+        """Remember the fresh results and write them to the state file when due."""
+        if self.state_file is None:
+            return
+        for result in results:
+            if result.info is not None:
+                snapshot.update(result.box, result.info, result.timestamp)
+        now = time.monotonic()
+        if not force and now - self._saved_at < self.save_interval:
+            return
+        self._saved_at = now
+        with self.profiler.measure("save"):
+            await asyncio.to_thread(snapshot.save, self.state_file)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m creality_wifi_box_client",
+        description="Monitor a fleet of Creality WiFi Boxes.",
+    )
+    parser.add_argument("boxes", nargs="+", type=parse_box, metavar="HOST[:PORT]", help="boxes to poll")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls (default: 5)")
+    parser.add_argument("--count", type=int, help="stop after this many polls")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds to wait for each box (default: 5)")
+    parser.add_argument("--json", action="store_true", help="write JSON lines instead of a live table")
+    parser.add_argument("--profile", action="store_true", help="report latency and CPU time per phase on exit")
+    parser.add_argument("--state-file", type=Path, help="keep the last known state of the fleet in this file")
+    parser.add_argument(
+        "--save-interval",
+        type=float,
+        default=60.0,
+        help="minimum seconds between writes of the state file (default: 60)",
+    )
+    parser.add_argument(
+        "--revalidate-window",
+        type=float,
+        help="seconds over which to spread the first polls after loading the state file (default: the interval)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, out: TextIO | None = None, err: TextIO | None = None) -> int:
+    """Run the monitor from the command line."""
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    err = err or sys.stderr
+    renderer = JsonLinesRenderer(out) if args.json else TableRenderer(out)
+    profiler = Profiler()
+    with suppress(KeyboardInterrupt):
+        asyncio.run(
+            Monitor(
+                args.boxes,
+                renderer.render,
+                profiler,
+                interval=args.interval,
+                count=args.count,
+                state_file=args.state_file,
+                revalidate_window=args.interval if args.revalidate_window is None else args.revalidate_window,
+                timeout=args.timeout,
+                save_interval=args.save_interval,
+            ).run()
+        )
+    if args.profile:
+        err.write(profiler.report() + "\n")
+    return 0
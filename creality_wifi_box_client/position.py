@@ -0,0 +1,217 @@
+"""Toolhead position parsing and compact motion traces."""
+
+import re
+import time
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from .box_info import BoxInfo
+
+# Positions are stored as integer micrometres.
+SCALE = 1000
+
+_AXIS = re.compile(r"(?<![\w.])([XYZ])\s*:?\s*(-?\d+(?:\.\d+)?)(?![\w.])", re.IGNORECASE)
+
+# M114 reports stepper counts after the position, as in "... Count X:800 Y:1600".
+_COUNT = re.compile(r"\bcount\b", re.IGNORECASE)
+
+# Deltas are stored in 16 bits as (minimum, maximum, escape). The escape value
+# marks a delta that does not fit, which is then stored in full separately.
+_UNSIGNED_RANGE = (0, 0xFFFE, 0xFFFF)
+_SIGNED_RANGE = (-0x7FFF, 0x7FFF, -0x8000)
+
+
+class Position(NamedTuple):
+    """Toolhead position in millimetres."""
+
+    x: float
+    y: float
+    z: float
+
+
+@lru_cache(maxsize=4096)
+def parse_position(value: str) -> Position | None:
+    """
+    Parse a position reported by the box, such as ``X10 Y20 Z0.3``.
+
+    Results are cached, so polls reporting an unchanged position reuse the
+    same Position object. The first value of each axis counts, anything after
+    ``Count`` is ignored, and a value with trailing junk such as ``1e-3`` is
+    not a number.
+
+    Returns:
+        The position, or None if an axis is missing
+
+    """
+    axes: dict[str, float] = {}
+    for axis, number in _AXIS.findall(_COUNT.split(value, maxsplit=1)[0]):
+        axes.setdefault(axis.upper(), float(number))
+    try:
+        return Position(axes["X"], axes["Y"], axes["Z"])
+    except KeyError:
+        return None
+
+
+@dataclass(frozen=True)
+class MotionSample:
+    """A single decoded sample of a motion trace."""
+
+    timestamp: float
+    position: Position
+    layer: int
+    feedrate_pct: int
+
+
+class MotionTrace:
+    """
+    Toolhead samples of one print, delta encoded in narrow typed arrays.
+
+    Times are kept in milliseconds and positions in micrometres, each as the
+    difference to the previous sample in 16 bits, so a sample usually costs
+    12 bytes. A difference that does not fit, such as those of the first
+    sample, a travel move of more than 32 mm or a gap of more than a minute,
+    is escaped and stored in full in a separate array.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty trace."""
+        self._time = array("H")
+        self._x = array("h")
+        self._y = array("h")
+        self._z = array("h")
+        self._layer = array("h")
+        self._feedrate = array("H")
+        self._overflow = array("q")
+        self._columns = (
+            (self._time, _UNSIGNED_RANGE),
+            (self._x, _SIGNED_RANGE),
+            (self._y, _SIGNED_RANGE),
+            (self._z, _SIGNED_RANGE),
+            (self._layer, _SIGNED_RANGE),
+        )
+        self._last = (0, 0, 0, 0, 0)
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self._time)
+
+    def append(self, timestamp: float, position: Position, layer: int, feedrate_pct: int) -> None:
+        """Add a sample to the end of the trace."""
+        current = (
+            round(timestamp * 1000),
+            round(position.x * SCALE),
+            round(position.y * SCALE),
+            round(position.z * SCALE),
+            layer,
+        )
+        for (values, (minimum, maximum, escape)), value, last in zip(self._columns, current, self._last, strict=True):
+            delta = value - last
+            if minimum <= delta <= maximum:
+                values.append(delta)
+            else:
+                values.append(escape)
+                self._overflow.append(delta)
+        self._feedrate.append(feedrate_pct)
+        self._last = current
+
+    def _decode(self) -> Iterator[tuple[int, ...]]:
+        """Iterate over the absolute time, position and layer of every sample."""
+        overflow = iter(self._overflow)
+        escapes = [escape for _, (_, _, escape) in self._columns]
+        current = (0, 0, 0, 0, 0)
+        for deltas in zip(self._time, self._x, self._y, self._z, self._layer, strict=True):
+            current = tuple(
+                value + (next(overflow) if delta == escape else delta)
+                for value, delta, escape in zip(current, deltas, escapes, strict=True)
+            )
+            yield current
+
+    def path(self) -> list[Position]:
+        """Get the toolhead path of the whole print."""
+        return [Position(x / SCALE, y / SCALE, z / SCALE) for _, x, y, z, _ in self._decode()]
+
+    def samples(self) -> Iterator[MotionSample]:
+        """Iterate over the decoded samples."""
+        for (timestamp, x, y, z, layer), feedrate in zip(self._decode(), self._feedrate, strict=True):
+            yield MotionSample(timestamp / 1000, Position(x / SCALE, y / SCALE, z / SCALE), layer, feedrate)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the samples in bytes."""
+        arrays = (self._time, self._x, self._y, self._z, self._layer, self._feedrate, self._overflow)
+        return sum(len(values) * values.itemsize for values in arrays)
+
+
+class MotionTraceStore:
+    """
+    Motion traces of every box, one per print.
+
+    Prints are told apart by their ``print_start_time``.
+
+    Example:
+        store = MotionTraceStore()
+        store.record("192.168.1.100:8080", await client.get_info())
+        path = store.trace("192.168.1.100:8080").path()
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._traces: dict[str, dict[int, MotionTrace]] = {}
+
+    def record(self, box: str, info: "BoxInfo", timestamp: float | None = None) -> bool:
+        """
+        Add a sample from a snapshot of a box.
+
+        Snapshots taken while no print is running are skipped, they belong
+        to no print and would pile up in a trace of their own.
+
+        Args:
+            box: The box as host:port
+            info: Snapshot of the box
+            timestamp: When the snapshot was taken (default: now)
+
+        Returns:
+            True if a sample was added, False if no print is running or the
+            position could not be parsed
+
+        """
+        if not info.mcu_is_print or not info.print_start_time:
+            return False
+        position = info.position
+        if position is None:
+            return False
+        trace = self._traces.setdefault(box, {}).setdefault(info.print_start_time, MotionTrace())
+        trace.append(time.time() if timestamp is None else timestamp, position, info.layer, info.cur_feedrate_pct)
+        return True
+
+    def prints(self, box: str) -> list[int]:
+        """Get the start times of the prints traced for a box."""
+        return list(self._traces.get(box, {}))
+
+    def trace(self, box: str, print_start_time: int | None = None) -> MotionTrace | None:
+        """
+        Get the trace of a print.
+
+        Args:
+            box: The box as host:port
+            print_start_time: The print (default: the latest one)
+
+        Returns:
+            The trace, or None if nothing was recorded
+
+        """
+        traces = self._traces.get(box)
+        if not traces:
+            return None
+        if print_start_time is None:
+            print_start_time = max(traces)
+        return traces.get(print_start_time)
+
+    def discard(self, box: str, print_start_time: int) -> None:
+        """Drop the trace of a print."""
+        self._traces.get(box, {}).pop(print_start_time, None)
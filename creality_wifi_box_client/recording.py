@@ -0,0 +1,200 @@
+"""Record traffic to a wifi box and replay it from a local stand-in server."""
+
+import asyncio
+import gzip
+import json
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from itertools import cycle
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from aiohttp import web
+
+RECORDING_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Exchange:
+    """A single request to ``protocal.csp`` and the response it received."""
+
+    timestamp: float
+    latency: float
+    query: str
+    status: int
+    body: str
+
+
+class Recorder:
+    """
+    Collect the exchanges made by one or more clients.
+
+    Example:
+        recorder = Recorder()
+        async with CrealityWifiBoxClient("192.168.1.100", 8080, recorder=recorder) as client:
+            await client.get_info()
+        recorder.save("box.rec.gz")
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty recorder."""
+        self.exchanges: list[Exchange] = []
+
+    def record(self, url: str, status: int, body: str, latency: float) -> None:
+        """
+        Record an exchange.
+
+        Args:
+            url: Requested URL, only the query string is kept
+            status: HTTP status of the response
+            body: Response body
+            latency: Time taken by the request in seconds
+
+        """
+        query = url.partition("?")[2]
+        self.exchanges.append(Exchange(time.time(), latency, query, status, body))
+
+    def save(self, path: str | Path) -> None:
+        """Write the recorded exchanges to a gzip compressed JSON lines file."""
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"version": RECORDING_VERSION}) + "\n")
+            for exchange in self.exchanges:
+                file.write(json.dumps(asdict(exchange), separators=(",", ":")) + "\n")
+
+
+def load_recording(path: str | Path) -> list[Exchange]:
+    """
+    Load exchanges saved by a Recorder.
+
+    Args:
+        path: Path of the recording
+
+    Returns:
+        The recorded exchanges in order
+
+    Raises:
+        ValueError: If the file is not a supported recording
+
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline() or "{}")
+        if header.get("version") != RECORDING_VERSION:
+            msg = f"Unsupported recording: {path}"
+            raise ValueError(msg)
+        return [Exchange(**json.loads(line)) for line in file]
+
+
+class _ReplayBox:
+    """The responses served for a single synthetic box."""
+
+    def __init__(self, exchanges: Sequence[Exchange]) -> None:
+        by_query: dict[str, list[Exchange]] = {}
+        for exchange in exchanges:
+            by_query.setdefault(exchange.query, []).append(exchange)
+        self._responses = {query: cycle(responses) for query, responses in by_query.items()}
+
+    def next_response(self, query: str) -> Exchange | None:
+        responses = self._responses.get(query)
+        return next(responses) if responses else None
+
+
+class ReplayServer:
+    """
+    Serve recorded exchanges back from a local HTTP stand-in.
+
+    Each recording is replayed as one box on its own port. Responses are
+    delayed by their recorded latency divided by ``speed``. Passing more
+    ``boxes`` than recordings builds a larger synthetic fleet by reusing the
+    recordings in turn.
+
+    Example:
+        async with ReplayServer([load_recording("box.rec.gz")], speed=10) as server:
+            host, port = server.addresses[0]
+            async with CrealityWifiBoxClient(host, port) as client:
+                await client.get_info()
+
+    """
+
+    def __init__(
+        self,
+        recordings: Sequence[Sequence[Exchange]],
+        *,
+        speed: float = 1.0,
+        boxes: int | None = None,
+        host: str = "127.0.0.1",
+    ) -> None:
+        """
+        Initialize the replay server.
+
+        Args:
+            recordings: Exchanges of each recorded box
+            speed: Replay speed, 0 serves responses without delay (default: 1)
+            boxes: Number of boxes to serve (default: one per recording)
+            host: Interface to listen on (default: 127.0.0.1)
+
+        Raises:
+            ValueError: If there is nothing to replay
+
+        """
+        if not recordings:
+            msg = "At least one recording is required"
+            raise ValueError(msg)
+        count = len(recordings) if boxes is None else boxes
+        self._boxes = [_ReplayBox(recordings[i % len(recordings)]) for i in range(count)]
+        self._speed = speed
+        self._host = host
+        self._by_port: dict[int, _ReplayBox] = {}
+        self._runner: web.AppRunner | None = None
+        self.addresses: list[tuple[str, int]] = []
+
+    async def start(self) -> list[tuple[str, int]]:
+        """
+        Start listening, one ephemeral port per box.
+
+        Returns:
+            The host and port of every box
+
+        """
+        app = web.Application()
+        app.router.add_get("/protocal.csp", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        for _ in self._boxes:
+            await web.TCPSite(self._runner, self._host, 0).start()
+        self.addresses = [(host, port) for host, port, *_ in self._runner.addresses]
+        self._by_port = {port: box for (_, port), box in zip(self.addresses, self._boxes, strict=True)}
+        return self.addresses
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> Self:
+        """Start the server when entering the async context manager."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Stop the server when leaving the async context manager."""
+        await self.close()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Answer a request with the next recorded response for its query."""
+        port = request.transport.get_extra_info("sockname")[1] if request.transport else None
+        box = self._by_port.get(port)
+        exchange = box.next_response(request.query_string) if box else None
+        if exchange is None:
+            raise web.HTTPNotFound
+        if self._speed > 0:
+            await asyncio.sleep(exchange.latency / self._speed)
+        return web.Response(status=exchange.status, text=exchange.body)
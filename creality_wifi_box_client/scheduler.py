@@ -0,0 +1,219 @@
+"""Central scheduler for polling a large fleet of wifi boxes."""
+
+import asyncio
+import contextlib
+import heapq
+import logging
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio. Multiples of it are evenly spread over
+# [0, 1) however many boxes have been added so far.
+_GOLDEN_FRACTION = (math.sqrt(5) - 1) / 2
+
+PollFunction = Callable[[str], Awaitable[object]]
+
+
+def _check_interval(interval: float) -> None:
+    """Reject intervals the schedule cannot advance by."""
+    if not interval > 0:
+        msg = f"Poll interval must be positive, got {interval}"
+        raise ValueError(msg)
+
+
+@dataclass
+class _Slot:
+    """The schedule of a single box."""
+
+    interval: float
+    base: float
+    entry: int = 0
+
+
+@dataclass
+class SchedulerStats:
+    """Counters describing the work done by the scheduler."""
+
+    dispatched: int = 0
+    skipped: int = 0
+    batches: int = 0
+
+
+class PollScheduler:
+    """
+    Own the next poll deadline of every box in a single heap.
+
+    Boxes are spread evenly over their poll period and every deadline gets a
+    small random offset, so polls do not line up in bursts. Deadlines advance
+    by exactly one interval from the previous slot rather than from when the
+    poll finished, so the schedule does not drift. Due polls are dispatched in
+    batches, at most ``max_in_flight`` at a time, and a box whose previous
+    poll is still running is skipped for that slot.
+
+    Example:
+        async def poll(box: str) -> None:
+            info = await clients[box].get_info()
+            ...
+
+        scheduler = PollScheduler(poll, max_in_flight=256)
+        for box in clients:
+            scheduler.add(box, interval=10)
+        await scheduler.run()
+
+    """
+
+    def __init__(
+        self,
+        poll: PollFunction,
+        *,
+        max_in_flight: int = 64,
+        jitter: float = 0.05,
+        batch_size: int = 256,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            poll: Called with the box for every due poll
+            max_in_flight: Maximum number of polls running at once (default: 64)
+            jitter: Random offset of each deadline, as a fraction of the interval
+            batch_size: Maximum number of polls dispatched per wakeup
+
+        """
+        self._poll = poll
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._jitter = jitter
+        self._batch_size = batch_size
+        self._slots: dict[str, _Slot] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._sequence = 0
+        self._added = 0
+        self._wakeup = asyncio.Event()
+        self._tasks: set[asyncio.Task[None]] = set()
+        # Kept apart from the slots, so a box removed and added again while
+        # its poll runs still counts as in flight.
+        self._in_flight: set[str] = set()
+        self.stats = SchedulerStats()
+
+    def __len__(self) -> int:
+        """Return the number of scheduled boxes."""
+        return len(self._slots)
+
+    def __contains__(self, box: object) -> bool:
+        """Check whether a box is scheduled."""
+        return box in self._slots
+
+    def add(self, box: str, interval: float) -> None:
+        """
+        Start polling a box every ``interval`` seconds.
+
+        The first poll falls in the box's own slot of the first period.
+
+        Raises:
+            ValueError: If the interval is not positive
+
+        """
+        _check_interval(interval)
+        phase = (self._added * _GOLDEN_FRACTION) % 1
+        self._added += 1
+        slot = _Slot(interval, time.monotonic() + phase * interval)
+        self._slots[box] = slot
+        self._push(box, slot)
+
+    def remove(self, box: str) -> None:
+        """Stop polling a box."""
+        self._slots.pop(box, None)
+
+    def set_interval(self, box: str, interval: float) -> None:
+        """
+        Change how often a box is polled.
+
+        The next poll moves to one new interval after the previous slot.
+
+        Raises:
+            ValueError: If the interval is not positive
+
+        """
+        _check_interval(interval)
+        slot = self._slots[box]
+        slot.base += interval - slot.interval
+        slot.interval = interval
+        self._push(box, slot)
+
+    def next_deadline(self, box: str) -> float:
+        """Get the monotonic time of the next poll of a box, without jitter."""
+        return self._slots[box].base
+
+    async def run(self) -> None:
+        """Dispatch polls as they become due, until cancelled."""
+        try:
+            while True:
+                await self._wait_until_due()
+                await self._dispatch_due()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+
+    def _push(self, box: str, slot: _Slot) -> None:
+        """
+        Queue the next poll of a box with a jittered deadline.
+
+        Entries are never removed from the heap. Only the latest entry of a
+        box that is still scheduled counts, older ones are dropped when popped.
+        """
+        offset = random.uniform(-self._jitter, self._jitter) * slot.interval
+        self._sequence += 1
+        slot.entry = self._sequence
+        heapq.heappush(self._heap, (slot.base + offset, self._sequence, box))
+        self._wakeup.set()
+
+    async def _wait_until_due(self) -> None:
+        """Sleep until the earliest deadline or until the schedule changes."""
+        self._wakeup.clear()
+        timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+        if timeout is not None and timeout <= 0:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _dispatch_due(self) -> None:
+        """Start up to one batch of due polls and schedule their next slots."""
+        now = time.monotonic()
+        dispatched = 0
+        while self._heap and self._heap[0][0] <= now and dispatched < self._batch_size:
+            _, entry, box = heapq.heappop(self._heap)
+            slot = self._slots.get(box)
+            if slot is None or slot.entry != entry:
+                continue
+            slot.base += slot.interval
+            if slot.base < now:
+                # Overloaded: skip the missed slots but keep the phase.
+                slot.base += math.ceil((now - slot.base) / slot.interval) * slot.interval
+            self._push(box, slot)
+            if box in self._in_flight:
+                self.stats.skipped += 1
+                continue
+            await self._semaphore.acquire()
+            self._in_flight.add(box)
+            task = asyncio.create_task(self._run_poll(box))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            dispatched += 1
+        if dispatched:
+            self.stats.dispatched += dispatched
+            self.stats.batches += 1
+
+    async def _run_poll(self, box: str) -> None:
+        """Run one poll, releasing its in-flight slot when done."""
+        try:
+            await self._poll(box)
+        except Exception:
+            _LOGGER.exception("Poll of %s failed", box)
+        finally:
+            self._in_flight.discard(box)
+            self._semaphore.release()
@@ -0,0 +1,152 @@
+"""Persistence of the last known state of a fleet of wifi boxes."""
+
+import gzip
+import json
+import random
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from .box_info import BoxInfo
+
+SNAPSHOT_VERSION = 1
+
+# Credentials of the box. They are never written to disk and load as empty
+# strings, the last known state is only used for display.
+SECRET_FIELDS = ("wifipasswd", "api_license", "did_string", "init_string")
+
+
+@dataclass(frozen=True)
+class KnownState:
+    """The last known information of a box and when it was received."""
+
+    info: BoxInfo
+    timestamp: float
+    stale: bool = False
+
+
+class FleetSnapshot:
+    """
+    The last known BoxInfo of every box, keyed by ``host:port``.
+
+    States loaded from a file are marked stale until the box is polled again.
+
+    Example:
+        snapshot = FleetSnapshot.load("fleet.json.gz")
+        delays = revalidation_delays(snapshot, ["192.168.1.100:8080"], window=60)
+        ...
+        snapshot.update("192.168.1.100:8080", await client.get_info())
+        snapshot.save("fleet.json.gz")
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty snapshot."""
+        self._states: dict[str, KnownState] = {}
+
+    def __len__(self) -> int:
+        """Return the number of known boxes."""
+        return len(self._states)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the known boxes."""
+        return iter(self._states)
+
+    def get(self, box: str) -> KnownState | None:
+        """Get the last known state of a box."""
+        return self._states.get(box)
+
+    def update(self, box: str, info: BoxInfo, timestamp: float | None = None) -> None:
+        """
+        Store fresh information for a box.
+
+        Args:
+            box: The box as host:port
+            info: Information just received from the box
+            timestamp: When it was received (default: now)
+
+        """
+        self._states[box] = KnownState(info, time.time() if timestamp is None else timestamp)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the snapshot to a gzip compressed JSON file, replacing it atomically.
+
+        The credentials in SECRET_FIELDS are left out.
+        """
+        exclude = set(SECRET_FIELDS)
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "boxes": {
+                box: {
+                    "time": state.timestamp,
+                    "info": state.info.model_dump(mode="json", by_alias=True, exclude=exclude),
+                }
+                for box, state in self._states.items()
+            },
+        }
+        path = Path(path)
+        temp_path = path.with_name(f"{path.name}.tmp")
+        with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FleetSnapshot":
+        """
+        Load a snapshot saved earlier, with every state marked stale.
+
+        A missing file gives an empty snapshot. The credentials in
+        SECRET_FIELDS are empty.
+
+        Raises:
+            ValueError: If the file is not a supported snapshot
+            OSError: If the file cannot be read or is not gzip compressed
+            EOFError: If the file is truncated
+
+        """
+        snapshot = cls()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return snapshot
+        msg = f"Unsupported snapshot: {path}"
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(msg)
+        blank = {BoxInfo.model_fields[name].alias or name: "" for name in SECRET_FIELDS}
+        try:
+            for box, state in data["boxes"].items():
+                info = BoxInfo.model_validate({**state["info"], **blank})
+                snapshot._states[box] = KnownState(info, state["time"], stale=True)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(msg) from e
+        return snapshot
+
+
+def revalidation_delays(snapshot: FleetSnapshot, boxes: Sequence[str], window: float) -> dict[str, float]:
+    """
+    Spread the first poll of every box evenly over a window.
+
+    Boxes with no known state come first, then the stalest ones. Each box gets
+    its own slot of the window with a random offset inside it, so a restart
+    does not poll the whole fleet at once.
+
+    Args:
+        snapshot: The loaded snapshot
+        boxes: Every box to poll, as host:port
+        window: Seconds over which to spread the polls
+
+    Returns:
+        Seconds to wait before polling each box
+
+    """
+
+    def age(box: str) -> float:
+        state = snapshot.get(box)
+        return float("-inf") if state is None else state.timestamp
+
+    ordered = sorted(boxes, key=age)
+    slot = window / len(ordered) if ordered else 0.0
+    return {box: (index + random.random()) * slot for index, box in enumerate(ordered)}
@@ -0,0 +1,118 @@
+"""Streaming file uploads to the TF card of the wifi box."""
+
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Self
+
+from .exceptions import CrealityWifiBoxError
+
+if TYPE_CHECKING:
+    from .creality_wifi_box_client import CrealityWifiBoxClient
+    from .hedging import RetryPolicy
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class UploadOptions:
+    """Configuration for streaming a file to the box."""
+
+    chunk_size: int = 64 * 1024
+    max_bytes_per_second: float | None = None
+
+
+class ChunkReader:
+    """
+    Read a file in chunks for an upload, without loading it into memory.
+
+    Reading is paced to ``max_bytes_per_second`` so the transfer leaves room
+    for telemetry polling, and ``progress`` is called with the bytes sent so
+    far and the total size after every chunk.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        options: UploadOptions,
+        progress: ProgressCallback | None = None,
+    ) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            path: File to read
+            options: Chunk size and bandwidth cap
+            progress: Called with (bytes sent, total bytes) after each chunk
+
+        """
+        self.size = path.stat().st_size
+        self._path = path
+        self._options = options
+        self._progress = progress
+        self._file: BinaryIO | None = None
+        self._sent = 0
+        self._start = 0.0
+
+    def __aiter__(self) -> Self:
+        """Return the reader as its own iterator."""
+        return self
+
+    async def __anext__(self) -> bytes:
+        """Read the next chunk, waiting if the bandwidth cap was reached."""
+        if self._file is None:
+            self._file = await asyncio.to_thread(self._path.open, "rb")
+            self._start = time.monotonic()
+        chunk = await asyncio.to_thread(self._file.read, self._options.chunk_size)
+        if not chunk:
+            self.close()
+            raise StopAsyncIteration
+        if self._options.max_bytes_per_second:
+            ahead = self._sent / self._options.max_bytes_per_second - (time.monotonic() - self._start)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+        self._sent += len(chunk)
+        if self._progress is not None:
+            self._progress(self._sent, self.size)
+        return chunk
+
+    def close(self) -> None:
+        """Close the file if it is open."""
+        if self._file is not None:
+            self._file.close()
+
+
+async def upload_to_many(
+    clients: Sequence["CrealityWifiBoxClient"],
+    path: str | Path,
+    *,
+    concurrency: int = 4,
+    options: UploadOptions | None = None,
+    retry: "RetryPolicy | None" = None,
+) -> list[bool | CrealityWifiBoxError]:
+    """
+    Upload one file to many boxes, at most ``concurrency`` at a time.
+
+    Args:
+        clients: Clients of the boxes to upload to
+        path: File to upload
+        concurrency: Maximum number of simultaneous uploads (default: 4)
+        options: Chunk size and per-upload bandwidth cap
+        retry: Retry failed uploads (default: disabled)
+
+    Returns:
+        For every client, True or the error that made its upload fail
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(client: "CrealityWifiBoxClient") -> bool | CrealityWifiBoxError:
+        async with semaphore:
+            try:
+                return await client.upload_file(path, options=options, retry=retry)
+            except CrealityWifiBoxError as e:
+                return e
+
+    return await asyncio.gather(*(upload(client) for client in clients))
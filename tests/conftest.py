@@ -0,0 +1,129 @@
+"""Fixtures for the wifi box tests."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from aiohttp import web
+
+from creality_wifi_box_client.box_info import BoxInfo
+
+from .const import (
+    TEST_BED_TEMP,
+    TEST_CHAMBER_TEMP,
+    TEST_CHANNEL,
+    TEST_CONNECT_STATUS,
+    TEST_CONSUMABLES_LEN,
+    TEST_D_PROGRESS,
+    TEST_FEEDRATE_PCT,
+    TEST_LAYER,
+    TEST_LED_STATE_ON,
+    TEST_LINK_STATUS_UP,
+    TEST_NOZZLE_TEMP,
+    TEST_PRINT_JOB_TIME,
+    TEST_PRINT_LEFT_TIME,
+    TEST_PRINT_PROGRESS,
+    TEST_PRINT_START_TIME,
+    TEST_PRINTED_TIMES,
+    TEST_SECURITY_TYPE,
+    TEST_STATE_ACTIVE,
+    TEST_TF_CARD_PRESENT,
+    TEST_TIMES_LEFT,
+    TEST_TOTAL_LAYER,
+    TEST_UPGRADE_STATUS,
+)
+
+
+@pytest.fixture
+def box_info_data() -> dict[str, Any]:
+    """Test data fixture."""
+    return {
+        "opt": "main",
+        "fname": "Info",
+        "function": "get",
+        "wanmode": "dhcp",
+        "wanphy_link": TEST_LINK_STATUS_UP,
+        "link_status": TEST_LINK_STATUS_UP,
+        "wanip": "192.168.1.100",
+        "ssid": "MyWiFi",
+        "channel": TEST_CHANNEL,
+        "security": TEST_SECURITY_TYPE,
+        "wifipasswd": "password123",
+        "apclissid": "MyAP",
+        "apclimac": "12:34:56:78:90:AB",
+        "iot_type": "Creality Cloud",
+        "connect": TEST_CONNECT_STATUS,
+        "model": "Ender-3",
+        "fan": 0,
+        "nozzleTemp": TEST_NOZZLE_TEMP,
+        "bedTemp": TEST_BED_TEMP,
+        "_1st_nozzleTemp": TEST_NOZZLE_TEMP,
+        "_2nd_nozzleTemp": TEST_NOZZLE_TEMP,
+        "chamberTemp": TEST_CHAMBER_TEMP,
+        "nozzleTemp2": TEST_NOZZLE_TEMP,
+        "bedTemp2": TEST_BED_TEMP,
+        "_1st_nozzleTemp2": TEST_NOZZLE_TEMP,
+        "_2nd_nozzleTemp2": TEST_NOZZLE_TEMP,
+        "chamberTemp2": TEST_CHAMBER_TEMP,
+        "print": "Welcome to Creality",
+        "printProgress": TEST_PRINT_PROGRESS,
+        "stop": 0,
+        "printStartTime": str(TEST_PRINT_START_TIME),
+        "state": TEST_STATE_ACTIVE,
+        "err": 0,
+        "boxVersion": "1.2.3",
+        "upgrade": "yes",
+        "upgradeStatus": TEST_UPGRADE_STATUS,
+        "tfCard": TEST_TF_CARD_PRESENT,
+        "dProgress": TEST_D_PROGRESS,
+        "layer": TEST_LAYER,
+        "pause": 0,
+        "reboot": 0,
+        "video": 0,
+        "DIDString": "abcdefg",
+        "APILicense": "xyz",
+        "InitString": "123",
+        "printedTimes": TEST_PRINTED_TIMES,
+        "timesLeftToPrint": TEST_TIMES_LEFT,
+        "ownerId": "owner123",
+        "curFeedratePct": TEST_FEEDRATE_PCT,
+        "curPosition": "X10 Y20 Z30",
+        "autohome": 0,
+        "repoPlrStatus": 0,
+        "modelVersion": "4.5.6",
+        "mcu_is_print": 1,
+        "printLeftTime": TEST_PRINT_LEFT_TIME,
+        "printJobTime": TEST_PRINT_JOB_TIME,
+        "netIP": "192.168.1.101",
+        "FilamentType": "PLA",
+        "ConsumablesLen": str(TEST_CONSUMABLES_LEN),
+        "TotalLayer": TEST_TOTAL_LAYER,
+        "led_state": TEST_LED_STATE_ON,
+        "error": 0,
+    }
+
+
+@pytest.fixture
+def box_info(box_info_data: dict[str, Any]) -> BoxInfo:
+    """Create a BoxInfo for a printing box."""
+    return BoxInfo.model_validate(box_info_data)
+
+
+@pytest.fixture
+async def hung_box() -> AsyncGenerator[int]:
+    """Run a box that accepts requests but never answers, and return its port."""
+    released = asyncio.Event()
+
+    async def hang(_: web.Request) -> web.Response:
+        await released.wait()
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_get("/protocal.csp", hang)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    yield runner.addresses[0][1]
+    released.set()
+    await runner.cleanup()
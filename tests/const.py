@@ -0,0 +1,31 @@
+"""Constants for the wifi box tests."""
+
+# Network Constants
+TEST_LINK_STATUS_UP = 1
+TEST_CHANNEL = 6
+TEST_SECURITY_TYPE = 3
+TEST_CONNECT_STATUS = 1
+
+# Temperature Constants
+TEST_NOZZLE_TEMP = 200
+TEST_BED_TEMP = 60
+TEST_CHAMBER_TEMP = 40
+
+# Print Status Constants
+TEST_PRINT_PROGRESS = 50
+TEST_PRINT_START_TIME = 1666666666
+TEST_STATE_ACTIVE = 1
+TEST_D_PROGRESS = 10
+TEST_LAYER = 100
+TEST_PRINTED_TIMES = 10
+TEST_TIMES_LEFT = 90
+TEST_FEEDRATE_PCT = 100
+TEST_PRINT_LEFT_TIME = 3600
+TEST_PRINT_JOB_TIME = 7200
+TEST_CONSUMABLES_LEN = 1000
+TEST_TOTAL_LAYER = 1000
+
+# Device Info Constants
+TEST_UPGRADE_STATUS = 0
+TEST_TF_CARD_PRESENT = 1
+TEST_LED_STATE_ON = 1
@@ -0,0 +1,75 @@
+"""Tests for confirming that commands took effect."""
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from creality_wifi_box_client.actuation import (
+    STATE_IDLE,
+    STATE_PAUSED,
+    STATE_STOPPED,
+    ConfirmPolicy,
+    await_effect,
+    is_paused,
+    is_resumed,
+    is_stopped,
+)
+from creality_wifi_box_client.box_info import BoxInfo
+from creality_wifi_box_client.exceptions import RequestTimeoutError
+
+FAST = ConfirmPolicy(timeout=1.0, initial_interval=0.02, min_interval=0.005)
+TEST_POLLS = 3
+
+
+def test_effects(box_info: BoxInfo) -> None:
+    """Test the expected states of each command."""
+    paused = box_info.model_copy(update={"pause": 1, "state": STATE_PAUSED})
+    stopped = box_info.model_copy(update={"stop": 1, "state": STATE_STOPPED, "mcu_is_print": 0})
+    idle = box_info.model_copy(update={"state": STATE_IDLE, "mcu_is_print": 0})
+
+    assert not is_paused(box_info)
+    assert is_paused(paused)
+    assert is_resumed(box_info)
+    assert not is_resumed(paused)
+    assert not is_stopped(box_info)
+    assert is_stopped(stopped)
+    assert is_stopped(idle)
+
+
+def test_effects_ignore_box_flags(box_info: BoxInfo) -> None:
+    """Test the flags the box sets when it accepts a command are not taken as the effect."""
+    pause_accepted = box_info.model_copy(update={"pause": 1})
+    resume_accepted = box_info.model_copy(update={"state": STATE_PAUSED})
+    stop_accepted = box_info.model_copy(update={"stop": 1})
+
+    assert not is_paused(pause_accepted)
+    assert not is_resumed(resume_accepted)
+    assert not is_stopped(stop_accepted)
+    assert not is_stopped(stop_accepted.model_copy(update={"mcu_is_print": 0}))
+
+
+@pytest.mark.asyncio
+async def test_await_effect(box_info: BoxInfo) -> None:
+    """Test polling until the effect is seen, ignoring errors."""
+    pause_accepted = box_info.model_copy(update={"pause": 1})
+    paused = pause_accepted.model_copy(update={"state": STATE_PAUSED})
+    get_info = AsyncMock(side_effect=[pause_accepted, RequestTimeoutError(), paused])
+    start = time.monotonic()
+
+    seen, polls = await await_effect(get_info, is_paused, start + FAST.timeout, FAST)
+
+    assert seen is not None
+    assert start < seen < start + FAST.timeout
+    assert polls == TEST_POLLS
+
+
+@pytest.mark.asyncio
+async def test_await_effect_deadline(box_info: BoxInfo) -> None:
+    """Test giving up once the deadline passes."""
+    get_info = AsyncMock(return_value=box_info)
+
+    seen, polls = await await_effect(get_info, is_paused, time.monotonic() + 0.05, FAST)
+
+    assert seen is None
+    assert polls == get_info.await_count
@@ -2,108 +2,32 @@
 
 from typing import Any
 
-import pytest
-
 from creality_wifi_box_client.box_info import BoxInfo
 
-# Network Constants
-TEST_LINK_STATUS_UP = 1
-TEST_CHANNEL = 6
-TEST_SECURITY_TYPE = 3
-TEST_CONNECT_STATUS = 1
-
-# Temperature Constants
-TEST_NOZZLE_TEMP = 200
-TEST_BED_TEMP = 60
-TEST_CHAMBER_TEMP = 40
-
-# Print Status Constants
-TEST_PRINT_PROGRESS = 50
-TEST_PRINT_START_TIME = 1666666666
-TEST_STATE_ACTIVE = 1
-TEST_D_PROGRESS = 10
-TEST_LAYER = 100
-TEST_PRINTED_TIMES = 10
-TEST_TIMES_LEFT = 90
-TEST_FEEDRATE_PCT = 100
-TEST_PRINT_LEFT_TIME = 3600
-TEST_PRINT_JOB_TIME = 7200
-TEST_CONSUMABLES_LEN = 1000
-TEST_TOTAL_LAYER = 1000
-
-# Device Info Constants
-TEST_UPGRADE_STATUS = 0
-TEST_TF_CARD_PRESENT = 1
-TEST_LED_STATE_ON = 1
-
-
-@pytest.fixture
-def box_info_data() -> dict[str, Any]:
-    """Test data fixture."""
-    return {
-        "opt": "main",
-        "fname": "Info",
-        "function": "get",
-        "wanmode": "dhcp",
-        "wanphy_link": TEST_LINK_STATUS_UP,
-        "link_status": TEST_LINK_STATUS_UP,
-        "wanip": "192.168.1.100",
-        "ssid": "MyWiFi",
-        "channel": TEST_CHANNEL,
-        "security": TEST_SECURITY_TYPE,
-        "wifipasswd": "password123",
-        "apclissid": "MyAP",
-        "apclimac": "12:34:56:78:90:AB",
-        "iot_type": "Creality Cloud",
-        "connect": TEST_CONNECT_STATUS,
-        "model": "Ender-3",
-        "fan": 0,
-        "nozzleTemp": TEST_NOZZLE_TEMP,
-        "bedTemp": TEST_BED_TEMP,
-        "_1st_nozzleTemp": TEST_NOZZLE_TEMP,
-        "_2nd_nozzleTemp": TEST_NOZZLE_TEMP,
-        "chamberTemp": TEST_CHAMBER_TEMP,
-        "nozzleTemp2": TEST_NOZZLE_TEMP,
-        "bedTemp2": TEST_BED_TEMP,
-        "_1st_nozzleTemp2": TEST_NOZZLE_TEMP,
-        "_2nd_nozzleTemp2": TEST_NOZZLE_TEMP,
-        "chamberTemp2": TEST_CHAMBER_TEMP,
-        "print": "Welcome to Creality",
-        "printProgress": TEST_PRINT_PROGRESS,
-        "stop": 0,
-        "printStartTime": str(TEST_PRINT_START_TIME),
-        "state": TEST_STATE_ACTIVE,
-        "err": 0,
-        "boxVersion": "1.2.3",
-        "upgrade": "yes",
-        "upgradeStatus": TEST_UPGRADE_STATUS,
-        "tfCard": TEST_TF_CARD_PRESENT,
-        "dProgress": TEST_D_PROGRESS,
-        "layer": TEST_LAYER,
-        "pause": 0,
-        "reboot": 0,
-        "video": 0,
-        "DIDString": "abcdefg",
-        "APILicense": "xyz",
-        "InitString": "123",
-        "printedTimes": TEST_PRINTED_TIMES,
-        "timesLeftToPrint": TEST_TIMES_LEFT,
-        "ownerId": "owner123",
-        "curFeedratePct": TEST_FEEDRATE_PCT,
-        "curPosition": "X10 Y20 Z30",
-        "autohome": 0,
-        "repoPlrStatus": 0,
-        "modelVersion": "4.5.6",
-        "mcu_is_print": 1,
-        "printLeftTime": TEST_PRINT_LEFT_TIME,
-        "printJobTime": TEST_PRINT_JOB_TIME,
-        "netIP": "192.168.1.101",
-        "FilamentType": "PLA",
-        "ConsumablesLen": str(TEST_CONSUMABLES_LEN),
-        "TotalLayer": TEST_TOTAL_LAYER,
-        "led_state": TEST_LED_STATE_ON,
-        "error": 0,
-    }
+from .const import (
+    TEST_BED_TEMP,
+    TEST_CHAMBER_TEMP,
+    TEST_CHANNEL,
+    TEST_CONNECT_STATUS,
+    TEST_CONSUMABLES_LEN,
+    TEST_D_PROGRESS,
+    TEST_FEEDRATE_PCT,
+    TEST_LAYER,
+    TEST_LED_STATE_ON,
+    TEST_LINK_STATUS_UP,
+    TEST_NOZZLE_TEMP,
+    TEST_PRINT_JOB_TIME,
+    TEST_PRINT_LEFT_TIME,
+    TEST_PRINT_PROGRESS,
+    TEST_PRINT_START_TIME,
+    TEST_PRINTED_TIMES,
+    TEST_SECURITY_TYPE,
+    TEST_STATE_ACTIVE,
+    TEST_TF_CARD_PRESENT,
+    TEST_TIMES_LEFT,
+    TEST_TOTAL_LAYER,
+    TEST_UPGRADE_STATUS,
+)
 
 
 def test_model_validate_network(box_info_data: dict[str, Any]) -> None:
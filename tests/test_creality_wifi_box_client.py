@@ -1,19 +1,31 @@
 """Tests for the Creality Wifi Box Client."""
 
-from collections.abc import Generator
+import asyncio
+from collections.abc import Awaitable, Callable, Generator
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 import pytest
 
+from creality_wifi_box_client.actuation import STATE_PAUSED, STATE_STOPPED, Actuation, ConfirmPolicy
+from creality_wifi_box_client.box_info import BoxInfo
 from creality_wifi_box_client.creality_wifi_box_client import CrealityWifiBoxClient
 from creality_wifi_box_client.exceptions import (
     ClientConnectionError,
     CommandError,
+    ConfirmationTimeoutError,
     InvalidResponseError,
     RequestTimeoutError,
 )
+from creality_wifi_box_client.hedging import HedgeBudget, HedgePolicy, LatencyTracker, RetryPolicy
+
+TEST_MIN_SAMPLES = 3
+TEST_RECORDED_LATENCIES = 2
+TEST_CONFIRM_POLLS = 2
+TEST_SHORT_TIMEOUT = 0.05
+TEST_TIMEOUT_RETRIES = 2
+FAST_CONFIRM = ConfirmPolicy(timeout=1.0, initial_interval=0.01, min_interval=0.005)
 
 
 @pytest.fixture
@@ -249,3 +261,206 @@ async def test_close_closed_session(client: CrealityWifiBoxClient, mock_session:
 
     await client.close()
     mock_session.close.assert_not_called()
+
+
+def fake_fetch(*steps: tuple[float, object]) -> Callable[[], Awaitable[object]]:
+    """Build a fetch replacement that answers each call after a delay."""
+    queue = list(steps)
+
+    async def fetch() -> object:
+        delay, outcome = queue.pop(0)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return fetch
+
+
+def hedged_client(budget: HedgeBudget | None = None) -> CrealityWifiBoxClient:
+    """Create a client that hedges after a handful of samples."""
+    policy = HedgePolicy(budget=budget or HedgeBudget(), min_samples=TEST_MIN_SAMPLES)
+    return CrealityWifiBoxClient("192.168.1.100", 8080, hedging=policy)
+
+
+async def warm_up(client: CrealityWifiBoxClient) -> None:
+    """Teach the client that requests normally answer quickly."""
+    with patch.object(client, "_fetch_info", fake_fetch(*[(0.01, "warm")] * TEST_MIN_SAMPLES)):
+        for _ in range(TEST_MIN_SAMPLES):
+            assert await client.get_info() == "warm"
+
+
+@pytest.mark.asyncio
+async def test_get_info_retry_success() -> None:
+    """Test get_info retries failed reads."""
+    client = CrealityWifiBoxClient("192.168.1.100", 8080, retry=RetryPolicy(retries=1, base_delay=0))
+    with patch.object(client, "_fetch_info", fake_fetch((0, RequestTimeoutError()), (0, "info"))):
+        assert await client.get_info() == "info"
+    assert client.hedge_stats.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_get_info_retry_exhausted() -> None:
+    """Test get_info raises once retries are used up."""
+    client = CrealityWifiBoxClient("192.168.1.100", 8080, retry=RetryPolicy(retries=1, base_delay=0))
+    steps = (0, ClientConnectionError("down")), (0, ClientConnectionError("still down"))
+    with patch.object(client, "_fetch_info", fake_fetch(*steps)), pytest.raises(ClientConnectionError, match="still"):
+        await client.get_info()
+
+
+@pytest.mark.asyncio
+async def test_get_info_retries_timeout(hung_box: int) -> None:
+    """Test a read that runs past the client timeout is retried and mapped."""
+    retry = RetryPolicy(retries=TEST_TIMEOUT_RETRIES, base_delay=0)
+    async with CrealityWifiBoxClient("127.0.0.1", hung_box, TEST_SHORT_TIMEOUT, retry=retry) as client:
+        with pytest.raises(RequestTimeoutError, match="timed out"):
+            await client.get_info()
+
+    assert client.hedge_stats.retries == TEST_TIMEOUT_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_command_timeout(hung_box: int) -> None:
+    """Test a command that runs past the client timeout."""
+    async with CrealityWifiBoxClient("127.0.0.1", hung_box, TEST_SHORT_TIMEOUT) as client:
+        with pytest.raises(RequestTimeoutError, match="'pause print' timed out"):
+            await client.pause_print()
+
+
+@pytest.mark.asyncio
+async def test_get_info_not_hedged_when_fast() -> None:
+    """Test no hedge is sent when the request answers in time."""
+    client = hedged_client()
+    await warm_up(client)
+    with patch.object(client, "_fetch_info", fake_fetch((0, "fast"))):
+        assert await client.get_info() == "fast"
+    assert client.hedge_stats.hedges_sent == 0
+
+
+@pytest.mark.asyncio
+async def test_get_info_hedge_wins() -> None:
+    """Test a hedge answers for a slow request."""
+    client = hedged_client()
+    await warm_up(client)
+    with (
+        patch.object(client, "_fetch_info", fake_fetch((5, "slow"), (0, "hedge"))),
+        patch.object(LatencyTracker, "record", autospec=True) as record,
+    ):
+        assert await client.get_info() == "hedge"
+    assert client.hedge_stats.hedges_sent == 1
+    assert client.hedge_stats.hedges_won == 1
+    # The abandoned request is recorded as a lower bound next to the hedge.
+    latencies = sorted(call.args[1] for call in record.call_args_list)
+    assert len(latencies) == TEST_RECORDED_LATENCIES
+    assert latencies[1] > latencies[0]
+
+
+@pytest.mark.asyncio
+async def test_get_info_primary_wins_after_hedge() -> None:
+    """Test the original request can still win after a hedge was sent."""
+    client = hedged_client()
+    await warm_up(client)
+    with patch.object(client, "_fetch_info", fake_fetch((0.05, "primary"), (0, RequestTimeoutError()))):
+        assert await client.get_info() == "primary"
+    assert client.hedge_stats.hedges_sent == 1
+    assert client.hedge_stats.hedges_won == 0
+
+
+@pytest.mark.asyncio
+async def test_get_info_hedge_both_fail() -> None:
+    """Test the original error is raised when both requests fail."""
+    client = hedged_client()
+    await warm_up(client)
+    steps = (0.05, ClientConnectionError("primary")), (0, ClientConnectionError("hedge"))
+    with patch.object(client, "_fetch_info", fake_fetch(*steps)), pytest.raises(ClientConnectionError, match="primary"):
+        await client.get_info()
+
+
+@pytest.mark.asyncio
+async def test_get_info_hedge_budget_exhausted() -> None:
+    """Test no hedge is sent when the budget is spent."""
+    client = hedged_client(HedgeBudget(ratio=0, max_tokens=0))
+    await warm_up(client)
+    with patch.object(client, "_fetch_info", fake_fetch((0.05, "slow"))):
+        assert await client.get_info() == "slow"
+    assert client.hedge_stats.hedges_sent == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_not_hedged(mock_session: MagicMock) -> None:
+    """Test commands are sent exactly once even when hedging is enabled."""
+    mock_session.get.side_effect = aiohttp.ServerTimeoutError()
+    client = CrealityWifiBoxClient("192.168.1.100", 8080, hedging=HedgePolicy(), retry=RetryPolicy())
+
+    with pytest.raises(RequestTimeoutError):
+        await client.pause_print()
+    mock_session.get.assert_called_once()
+
+
+@pytest.fixture
+def accepted(mock_session: MagicMock) -> MagicMock:
+    """Make the box accept every command."""
+    mock_response = AsyncMock()
+    mock_response.text.return_value = '{"error": 0}'
+    mock_response.raise_for_status = MagicMock()
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    return mock_session
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("accepted")
+async def test_pause_print_confirmed(client: CrealityWifiBoxClient, box_info: BoxInfo) -> None:
+    """Test pause_print waits until the printer is paused."""
+    pause_accepted = box_info.model_copy(update={"pause": 1})
+    paused = pause_accepted.model_copy(update={"state": STATE_PAUSED})
+    with patch.object(client, "get_info", AsyncMock(side_effect=[pause_accepted, paused])):
+        actuation = await client.pause_print(confirm=FAST_CONFIRM)
+
+    assert isinstance(actuation, Actuation)
+    assert actuation.command == "pause print"
+    assert actuation.polls == TEST_CONFIRM_POLLS
+    assert actuation.time_to_effect is not None
+    assert 0 <= actuation.time_to_ack <= actuation.time_to_effect
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("accepted")
+async def test_resume_and_stop_confirmed(client: CrealityWifiBoxClient, box_info: BoxInfo) -> None:
+    """Test resume_print and stop_print confirm their effects."""
+    stopped = box_info.model_copy(update={"stop": 1, "state": STATE_STOPPED, "mcu_is_print": 0})
+    with patch.object(client, "get_info", AsyncMock(side_effect=[box_info, stopped])):
+        resumed = await client.resume_print(confirm=FAST_CONFIRM)
+        halted = await client.stop_print(confirm=FAST_CONFIRM)
+
+    assert isinstance(resumed, Actuation)
+    assert resumed.command == "resume print"
+    assert isinstance(halted, Actuation)
+    assert halted.command == "stop print"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("accepted")
+async def test_pause_print_not_confirmed(client: CrealityWifiBoxClient, box_info: BoxInfo) -> None:
+    """Test a command the box accepts but the printer never acts on."""
+    policy = ConfirmPolicy(timeout=0.05, initial_interval=0.01, min_interval=0.01)
+    pause_accepted = box_info.model_copy(update={"pause": 1})
+    with (
+        patch.object(client, "get_info", AsyncMock(return_value=pause_accepted)),
+        pytest.raises(ConfirmationTimeoutError, match="'pause print' was not confirmed") as exc_info,
+    ):
+        await client.pause_print(confirm=policy)
+
+    actuation = exc_info.value.actuation
+    assert actuation is not None
+    assert actuation.command == "pause print"
+    assert actuation.time_to_effect is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("accepted")
+async def test_unconfirmed_command_skips_polling(client: CrealityWifiBoxClient) -> None:
+    """Test commands without confirmation return once accepted."""
+    with patch.object(client, "get_info", AsyncMock()) as get_info:
+        assert await client.pause_print() is True
+
+    get_info.assert_not_called()
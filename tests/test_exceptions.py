@@ -3,6 +3,7 @@
 from creality_wifi_box_client.exceptions import (
     ClientConnectionError,
     CommandError,
+    ConfirmationTimeoutError,
     CrealityWifiBoxError,
     InvalidResponseError,
     RequestTimeoutError,
@@ -42,3 +43,11 @@ def test_command_error() -> None:
     exc = CommandError("Command failed")
     assert str(exc) == "Command failed"
     assert isinstance(exc, CrealityWifiBoxError)
+
+
+def test_confirmation_timeout_error() -> None:
+    """Test ConfirmationTimeoutError."""
+    exc = ConfirmationTimeoutError("Not confirmed")
+    assert str(exc) == "Not confirmed"
+    assert exc.actuation is None
+    assert isinstance(exc, CommandError)
@@ -0,0 +1,58 @@
+"""Tests for the hedging and retry policies."""
+
+from creality_wifi_box_client.hedging import HedgeBudget, HedgePolicy, LatencyTracker, RetryPolicy
+
+TEST_WINDOW = 10
+TEST_MIN_SAMPLES = 5
+TEST_SAMPLES = 20
+TEST_OLDEST_IN_WINDOW = 10.0
+TEST_MEDIAN = 15.0
+TEST_SLOWEST = 19.0
+TEST_MAX_DELAY = 0.3
+
+
+def test_latency_tracker_needs_min_samples() -> None:
+    """Test no percentile is reported before enough samples exist."""
+    tracker = LatencyTracker(window=TEST_WINDOW, min_samples=TEST_MIN_SAMPLES)
+    for _ in range(TEST_MIN_SAMPLES - 1):
+        tracker.record(0.1)
+    assert tracker.percentile(95) is None
+
+
+def test_latency_tracker_percentile() -> None:
+    """Test percentiles over the sliding window."""
+    tracker = LatencyTracker(window=TEST_WINDOW, min_samples=TEST_MIN_SAMPLES)
+    for i in range(TEST_SAMPLES):
+        tracker.record(float(i))
+
+    assert len(tracker) == TEST_WINDOW
+    assert tracker.percentile(0) == TEST_OLDEST_IN_WINDOW
+    assert tracker.percentile(50) == TEST_MEDIAN
+    assert tracker.percentile(100) == TEST_SLOWEST
+
+
+def test_hedge_budget() -> None:
+    """Test the budget is spent by hedges and refilled by requests."""
+    budget = HedgeBudget(ratio=0.5, max_tokens=1.0)
+    assert budget.try_acquire() is True
+    assert budget.try_acquire() is False
+
+    budget.deposit()
+    assert budget.try_acquire() is False
+    budget.deposit()
+    budget.deposit()
+    assert budget.tokens == 1.0
+    assert budget.try_acquire() is True
+
+
+def test_hedge_policy_shares_default_budget() -> None:
+    """Test policies share the global budget by default."""
+    assert HedgePolicy().budget is HedgePolicy().budget
+
+
+def test_retry_policy_delay() -> None:
+    """Test retry delays are jittered and capped."""
+    policy = RetryPolicy(retries=3, base_delay=0.1, max_delay=TEST_MAX_DELAY)
+    for attempt in range(5):
+        delay = policy.delay(attempt)
+        assert 0 <= delay <= min(TEST_MAX_DELAY, 0.1 * 2**attempt)
@@ -0,0 +1,250 @@
+"""Tests for the fleet monitor command line."""
+
+import argparse
+import asyncio
+import gzip
+import io
+import json
+import runpy
+import time
+from collections.abc import AsyncGenerator, Coroutine
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from creality_wifi_box_client.box_info import BoxInfo
+from creality_wifi_box_client.monitor import (
+    DEFAULT_PORT,
+    JsonLinesRenderer,
+    Monitor,
+    PollResult,
+    TableRenderer,
+    describe_state,
+    main,
+    parse_box,
+)
+from creality_wifi_box_client.recording import Exchange, ReplayServer
+from creality_wifi_box_client.snapshot import FleetSnapshot
+
+INFO_QUERY = "fname=Info&opt=main&function=get"
+TEST_PORT = 1234
+TEST_SAVES = 2
+TEST_SWEEPS = 2
+
+
+@pytest.fixture
+async def replay(box_info_data: dict[str, Any]) -> AsyncGenerator[ReplayServer]:
+    """Serve a box from a replay server."""
+    recording = [Exchange(time.time(), 0.0, INFO_QUERY, 200, json.dumps(box_info_data))]
+    async with ReplayServer([recording], speed=0) as server:
+        yield server
+
+
+def test_parse_box() -> None:
+    """Test parsing box addresses."""
+    assert parse_box("10.0.0.2") == ("10.0.0.2", DEFAULT_PORT)
+    assert parse_box(f"10.0.0.2:{TEST_PORT}") == ("10.0.0.2", TEST_PORT)
+    with pytest.raises(argparse.ArgumentTypeError, match="invalid box address"):
+        parse_box("10.0.0.2:http")
+
+
+def test_describe_state(box_info: BoxInfo) -> None:
+    """Test describing the printer state."""
+    assert describe_state(box_info) == "printing"
+    assert describe_state(box_info.model_copy(update={"pause": 1})) == "paused"
+    assert describe_state(box_info.model_copy(update={"stop": 1})) == "stopped"
+    assert describe_state(box_info.model_copy(update={"mcu_is_print": 0})) == "idle"
+
+
+def test_table_renderer_redraws_changed_cells(box_info: BoxInfo) -> None:
+    """Test only changed cells are written after the first draw."""
+    out = io.StringIO()
+    renderer = TableRenderer(out)
+    renderer.render([PollResult("a", box_info, None, 0), PollResult("b", None, "timed out", 0)])
+    first = out.getvalue()
+    assert first.startswith("\x1b[2J")
+    assert "printing" in first
+    assert "timed out" in first
+
+    out.seek(0)
+    out.truncate()
+    changed = box_info.model_copy(update={"print_progress": 51})
+    renderer.render([PollResult("a", changed, None, 0), PollResult("b", None, "timed out", 0)])
+    assert out.getvalue() == "\x1b[3;40H51%     \x1b[5;1H"
+
+
+def test_table_renderer_single_box_updates(box_info: BoxInfo) -> None:
+    """Test boxes keep their rows when rendered one at a time."""
+    out = io.StringIO()
+    renderer = TableRenderer(out)
+    renderer.render([PollResult("a", box_info, None, 0, stale=True), PollResult("b", box_info, None, 0, stale=True)])
+    assert "printing (stale)" in out.getvalue()
+
+    out.seek(0)
+    out.truncate()
+    renderer.render([PollResult("b", box_info, None, 0)])
+    assert out.getvalue() == "\x1b[4;23Hprinting        \x1b[5;1H"
+
+
+def test_table_renderer_shows_box_errors(box_info: BoxInfo) -> None:
+    """Test error codes reported by the box are shown."""
+    out = io.StringIO()
+    TableRenderer(out).render([PollResult("a", box_info.model_copy(update={"err": 3}), None, 0)])
+    assert "err 3" in out.getvalue()
+
+
+def test_json_lines_renderer(box_info: BoxInfo) -> None:
+    """Test JSON lines output."""
+    out = io.StringIO()
+    JsonLinesRenderer(out).render([PollResult("a", box_info, None, 1.5), PollResult("b", None, "down", 2)])
+    first, second = (json.loads(line) for line in out.getvalue().splitlines())
+    assert first["box"] == "a"
+    assert first["state"] == "printing"
+    assert first["progress"] == box_info.print_progress
+    assert first["stale"] is False
+    assert second == {"box": "b", "time": 2, "stale": False, "error": "down"}
+
+
+@pytest.mark.asyncio
+async def test_main_json(replay: ReplayServer, unused_tcp_port: int) -> None:
+    """Test polling a fleet with JSON lines output."""
+    host, port = replay.addresses[0]
+    out = io.StringIO()
+    argv = ["--json", "--count", str(TEST_SWEEPS), "--interval", "0", f"{host}:{port}", f"127.0.0.1:{unused_tcp_port}"]
+
+    assert await asyncio.to_thread(main, argv, out) == 0
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(records) == 2 * TEST_SWEEPS
+    assert records[0]["state"] == "printing"
+    assert "Failed to connect" in records[1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_main_hung_box(replay: ReplayServer, hung_box: int) -> None:
+    """Test a box that never answers times out without stopping the monitor."""
+    host, port = replay.addresses[0]
+    out = io.StringIO()
+    argv = ["--json", "--count", "1", "--timeout", "0.05", f"{host}:{port}", f"127.0.0.1:{hung_box}"]
+
+    assert await asyncio.to_thread(main, argv, out) == 0
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["state"] == "printing"
+    assert records[1]["error"] == "Request to WiFi Box timed out"
+
+
+@pytest.mark.asyncio
+async def test_main_table_profile(replay: ReplayServer) -> None:
+    """Test the live table with profiling."""
+    host, port = replay.addresses[0]
+    out = io.StringIO()
+    err = io.StringIO()
+
+    assert await asyncio.to_thread(main, ["--count", "1", "--profile", f"{host}:{port}"], out, err) == 0
+
+    assert "printing" in out.getvalue()
+    report = err.getvalue()
+    for phase in ("request", "sweep", "render", "total cpu"):
+        assert phase in report
+
+
+def test_main_interrupted() -> None:
+    """Test Ctrl-C stops the monitor cleanly."""
+
+    def interrupt(coro: Coroutine[Any, Any, None]) -> None:
+        coro.close()
+        raise KeyboardInterrupt
+
+    with patch("creality_wifi_box_client.monitor.asyncio.run", side_effect=interrupt):
+        assert main(["10.0.0.2"], io.StringIO()) == 0
+
+
+def test_module_entry_point() -> None:
+    """Test running the package as a module."""
+    with (
+        patch("creality_wifi_box_client.monitor.main", return_value=0),
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        runpy.run_module("creality_wifi_box_client", run_name="__main__")
+    assert exc_info.value.code == 0
+
+
+@pytest.mark.asyncio
+async def test_main_warm_start(replay: ReplayServer, tmp_path: Path, unused_tcp_port: int) -> None:
+    """Test the last known state is shown as stale, then revalidated and saved."""
+    host, port = replay.addresses[0]
+    boxes = [f"{host}:{port}", f"127.0.0.1:{unused_tcp_port}"]
+    state_file = tmp_path / "fleet.json.gz"
+
+    await asyncio.to_thread(
+        main,
+        ["--json", "--count", "1", "--revalidate-window", "0", "--state-file", str(state_file), *boxes],
+        io.StringIO(),
+    )
+    assert list(FleetSnapshot.load(state_file)) == [boxes[0]]
+
+    out = io.StringIO()
+    err = io.StringIO()
+    argv = ["--json", "--count", "2", "--interval", "0", "--revalidate-window", "0.05", "--profile"]
+    argv += ["--state-file", str(state_file), *boxes]
+    assert await asyncio.to_thread(main, argv, out, err) == 0
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["box"] == boxes[0]
+    assert records[0]["stale"] is True
+    assert [record["stale"] for record in records[1:]] == [False] * 4
+    assert {record["box"] for record in records[1:3]} == set(boxes)
+    assert "revalidate" in err.getvalue()
+    assert "save" in err.getvalue()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"not gzip",
+        gzip.compress(b'{"version": 1, "boxes": {}}')[:-10],
+        gzip.compress(b"{not json"),
+        gzip.compress(b'{"version": 0, "boxes": {}}'),
+        gzip.compress(b'{"version": 1, "boxes": {"a:80": {"time": 0, "info": {}}}}'),
+    ],
+)
+async def test_main_corrupt_state_file(
+    replay: ReplayServer, tmp_path: Path, content: bytes, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a state file that cannot be loaded is ignored and replaced."""
+    host, port = replay.addresses[0]
+    state_file = tmp_path / "fleet.json.gz"
+    state_file.write_bytes(content)
+    out = io.StringIO()
+
+    argv = ["--json", "--count", "2", "--interval", "0", "--revalidate-window", "0", "--state-file", str(state_file)]
+    assert await asyncio.to_thread(main, [*argv, f"{host}:{port}"], out) == 0
+
+    assert "Ignoring state file" in caplog.text
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["stale"] for record in records] == [False, False]
+    assert list(FleetSnapshot.load(state_file)) == [f"{host}:{port}"]
+
+
+@pytest.mark.asyncio
+async def test_state_file_saved_on_cadence(replay: ReplayServer, tmp_path: Path) -> None:
+    """Test the state file is not rewritten after every sweep."""
+    host, port = replay.addresses[0]
+    monitor = Monitor(
+        [(host, port)],
+        lambda _: None,
+        interval=0,
+        count=TEST_SWEEPS + 1,
+        state_file=tmp_path / "fleet.json.gz",
+        save_interval=3600,
+    )
+
+    with patch.object(FleetSnapshot, "save", autospec=True) as save:
+        await monitor.run()
+
+    # Once after the warm start and once after the last sweep.
+    assert save.call_count == TEST_SAVES
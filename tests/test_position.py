@@ -0,0 +1,142 @@
+"""Tests for position parsing and motion traces."""
+
+import pytest
+
+from creality_wifi_box_client.box_info import BoxInfo
+from creality_wifi_box_client.position import (
+    MotionTrace,
+    MotionTraceStore,
+    Position,
+    parse_position,
+)
+
+from .const import TEST_FEEDRATE_PCT, TEST_LAYER, TEST_PRINT_START_TIME
+
+TEST_PATH = [Position(10.0, 20.0, 0.2), Position(10.5, 19.25, 0.2), Position(-3.125, 0.0, 0.4)]
+TEST_TIMESTAMP = 1700000000.25
+TEST_SAMPLE_BYTES = 12
+TEST_ESCAPE_BYTES = 8
+TEST_ESCAPES = 6
+TEST_ABSOLUTE_SAMPLE_BYTES = 26
+TEST_LONG_PRINT = 10000
+TEST_MAX_LONG_PRINT_BYTES = 14 * TEST_LONG_PRINT
+TEST_NEXT_PRINT = TEST_PRINT_START_TIME + 3600
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("X10 Y20 Z30", Position(10.0, 20.0, 30.0)),
+        ("X:10.50 Y:-2.25 Z:0.30 E:12.00", Position(10.5, -2.25, 0.3)),
+        ("x1 y2 z3", Position(1.0, 2.0, 3.0)),
+        ("X:10.00 Y:20.00 Z:0.30 E:0.00 Count X:800 Y:1600 Z:120", Position(10.0, 20.0, 0.3)),
+        ("X1 Y2 Z3 X4", Position(1.0, 2.0, 3.0)),
+        ("X:1e-3 Y:2 Z:3", None),
+        ("X1.2.3 Y2 Z3", None),
+        ("X10 Y20", None),
+        ("", None),
+    ],
+)
+def test_parse_position(value: str, expected: Position | None) -> None:
+    """Test parsing the formats reported by the box."""
+    assert parse_position(value) == expected
+
+
+def test_parse_position_cached() -> None:
+    """Test identical strings reuse the parsed result."""
+    assert parse_position("X1.5 Y2 Z3") is parse_position("X1.5 Y2 Z3")
+
+
+def test_box_info_position(box_info: BoxInfo) -> None:
+    """Test the parsed position of a snapshot."""
+    assert box_info.position == Position(10.0, 20.0, 30.0)
+    assert box_info.position.z == box_info.position[2]
+
+
+def test_motion_trace_round_trip() -> None:
+    """Test samples are decoded exactly."""
+    trace = MotionTrace()
+    for index, position in enumerate(TEST_PATH):
+        trace.append(TEST_TIMESTAMP + index, position, index, TEST_FEEDRATE_PCT)
+
+    assert len(trace) == len(TEST_PATH)
+    assert trace.path() == TEST_PATH
+    samples = list(trace.samples())
+    assert [sample.timestamp for sample in samples] == [TEST_TIMESTAMP + i for i in range(len(TEST_PATH))]
+    assert [sample.layer for sample in samples] == list(range(len(TEST_PATH)))
+    assert {sample.feedrate_pct for sample in samples} == {TEST_FEEDRATE_PCT}
+    assert trace.nbytes == TEST_SAMPLE_BYTES * len(TEST_PATH) + TEST_ESCAPE_BYTES
+
+
+def test_motion_trace_escapes() -> None:
+    """Test travel moves, gaps and clock steps back that do not fit a delta are kept exactly."""
+    samples = [
+        (TEST_TIMESTAMP, Position(10.0, 20.0, 0.2), 1),
+        (TEST_TIMESTAMP + 1, Position(200.0, 20.0, 0.2), 1),
+        (TEST_TIMESTAMP + 3600, Position(200.0, 20.0, 0.4), 2),
+        (TEST_TIMESTAMP + 10, Position(-200.0, -20.0, 0.4), 2),
+    ]
+    trace = MotionTrace()
+    for timestamp, position, layer in samples:
+        trace.append(timestamp, position, layer, TEST_FEEDRATE_PCT)
+
+    decoded = [(sample.timestamp, sample.position, sample.layer) for sample in trace.samples()]
+    assert decoded == samples
+    # The first time, the long x move, the gap, then the clock step back with its x and y moves.
+    assert trace.nbytes == TEST_SAMPLE_BYTES * len(samples) + TEST_ESCAPE_BYTES * TEST_ESCAPES
+
+
+def test_motion_trace_saves_space() -> None:
+    """Test a long print with regular travel moves costs about half of absolute storage."""
+    trace = MotionTrace()
+    for index in range(TEST_LONG_PRINT):
+        position = Position(100 + 10 * (index % 7), 100 - 0.5 * (index % 13), 0.2 * (index // 500))
+        trace.append(TEST_TIMESTAMP + 5 * index, position, index // 500, TEST_FEEDRATE_PCT)
+
+    assert trace.nbytes < TEST_MAX_LONG_PRINT_BYTES < TEST_ABSOLUTE_SAMPLE_BYTES * TEST_LONG_PRINT
+    assert trace.path()[-1] == Position(130.0, 99.0, 3.8)
+
+
+def test_motion_trace_store(box_info: BoxInfo) -> None:
+    """Test traces are kept per box and per print."""
+    store = MotionTraceStore()
+    assert store.trace("a") is None
+    assert store.record("a", box_info, TEST_TIMESTAMP) is True
+    assert store.record("a", box_info.model_copy(update={"cur_position": "X11 Y20 Z30"})) is True
+    next_print = box_info.model_copy(update={"print_start_time": TEST_NEXT_PRINT})
+    assert store.record("a", next_print, TEST_TIMESTAMP) is True
+
+    assert store.prints("a") == [TEST_PRINT_START_TIME, TEST_NEXT_PRINT]
+    assert store.prints("b") == []
+    first = store.trace("a", TEST_PRINT_START_TIME)
+    assert first is not None
+    assert first.path() == [Position(10.0, 20.0, 30.0), Position(11.0, 20.0, 30.0)]
+    assert next(first.samples()).layer == TEST_LAYER
+    latest = store.trace("a")
+    assert latest is not None
+    assert len(latest) == 1
+
+    store.discard("a", TEST_PRINT_START_TIME)
+    assert store.prints("a") == [TEST_NEXT_PRINT]
+
+
+def test_motion_trace_store_unparsable(box_info: BoxInfo) -> None:
+    """Test snapshots without a usable position are skipped."""
+    store = MotionTraceStore()
+    assert store.record("a", box_info.model_copy(update={"cur_position": ""})) is False
+    assert store.prints("a") == []
+
+
+@pytest.mark.parametrize(
+    "update", [{"mcu_is_print": 0, "print_start_time": 0}, {"mcu_is_print": 0}, {"print_start_time": 0}]
+)
+def test_motion_trace_store_idle(box_info: BoxInfo, update: dict[str, int]) -> None:
+    """Test snapshots taken while no print is running are skipped."""
+    store = MotionTraceStore()
+    assert store.record("a", box_info, TEST_TIMESTAMP) is True
+    assert store.record("a", box_info.model_copy(update=update), TEST_TIMESTAMP + 1) is False
+
+    assert store.prints("a") == [TEST_PRINT_START_TIME]
+    trace = store.trace("a")
+    assert trace is not None
+    assert len(trace) == 1
@@ -0,0 +1,118 @@
+"""Tests for recording and replaying wifi box traffic."""
+
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from creality_wifi_box_client.creality_wifi_box_client import CrealityWifiBoxClient
+from creality_wifi_box_client.exceptions import ClientConnectionError, CommandError
+from creality_wifi_box_client.recording import Exchange, Recorder, ReplayServer, load_recording
+
+INFO_QUERY = "fname=Info&opt=main&function=get"
+PAUSE_QUERY = "fname=net&opt=iot_conf&function=set&pause=1"
+TEST_STATUS_OK = 200
+TEST_LATENCY = 0.2
+TEST_SPEED = 2
+TEST_FLEET_SIZE = 3
+
+
+def exchange(query: str, body: str, latency: float = 0.0) -> Exchange:
+    """Create a recorded exchange."""
+    return Exchange(time.time(), latency, query, TEST_STATUS_OK, body)
+
+
+def test_recorder_round_trip(tmp_path: Path) -> None:
+    """Test saving and loading a recording."""
+    recorder = Recorder()
+    recorder.record(f"http://1.2.3.4:80/protocal.csp?{INFO_QUERY}", TEST_STATUS_OK, '{"a": 1}', 0.05)
+    path = tmp_path / "box.rec.gz"
+    recorder.save(path)
+
+    exchanges = load_recording(path)
+    assert exchanges == recorder.exchanges
+    assert exchanges[0].query == INFO_QUERY
+
+
+def test_load_unsupported_recording(tmp_path: Path) -> None:
+    """Test loading a file that is not a recording."""
+    path = tmp_path / "other.gz"
+    with gzip.open(path, "wt") as file:
+        file.write(json.dumps({"version": 99}))
+
+    with pytest.raises(ValueError, match="Unsupported recording"):
+        load_recording(path)
+
+
+def test_replay_requires_recordings() -> None:
+    """Test a replay server needs something to serve."""
+    with pytest.raises(ValueError, match="At least one recording"):
+        ReplayServer([])
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(box_info_data: dict[str, Any]) -> None:
+    """Test traffic recorded from a replayed box replays identically."""
+    body = json.dumps(box_info_data)
+    recording = [exchange(INFO_QUERY, body), exchange(PAUSE_QUERY, '{"error": 0}')]
+    recorder = Recorder()
+
+    async with ReplayServer([recording], speed=0) as server:
+        host, port = server.addresses[0]
+        async with CrealityWifiBoxClient(host, port, recorder=recorder) as client:
+            info = await client.get_info()
+            assert await client.pause_print() is True
+
+    assert info.model == box_info_data["model"]
+    assert [e.query for e in recorder.exchanges] == [INFO_QUERY, PAUSE_QUERY]
+    assert recorder.exchanges[0].body == body
+    assert recorder.exchanges[0].status == TEST_STATUS_OK
+
+
+async def pause(host: str, port: int) -> bool:
+    """Pause a replayed box, returning False if the box reports an error."""
+    async with CrealityWifiBoxClient(host, port) as client:
+        try:
+            return await client.pause_print()
+        except CommandError:
+            return False
+
+
+@pytest.mark.asyncio
+async def test_replay_speed() -> None:
+    """Test responses are delayed by the recorded latency divided by the speed."""
+    recording = [exchange(PAUSE_QUERY, '{"error": 0}', latency=TEST_LATENCY)]
+
+    async with ReplayServer([recording], speed=TEST_SPEED) as server:
+        start = time.monotonic()
+        await pause(*server.addresses[0])
+        elapsed = time.monotonic() - start
+
+    assert elapsed >= TEST_LATENCY / TEST_SPEED
+
+
+@pytest.mark.asyncio
+async def test_replay_fleet() -> None:
+    """Test recordings are reused to serve a larger synthetic fleet."""
+    recordings = [[exchange(PAUSE_QUERY, '{"error": 0}')], [exchange(PAUSE_QUERY, '{"error": 1}')]]
+
+    async with ReplayServer(recordings, speed=0, boxes=TEST_FLEET_SIZE) as server:
+        assert len(server.addresses) == TEST_FLEET_SIZE
+        results = [await pause(*address) for address in server.addresses]
+
+    assert results == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_replay_unknown_query() -> None:
+    """Test requests that were never recorded are answered with 404."""
+    server = ReplayServer([[exchange(PAUSE_QUERY, '{"error": 0}')]], speed=0)
+    await server.start()
+    async with CrealityWifiBoxClient(*server.addresses[0]) as client:
+        with pytest.raises(ClientConnectionError, match="404"):
+            await client.get_info()
+    await server.close()
+    await server.close()
@@ -0,0 +1,235 @@
+"""Tests for the fleet poll scheduler."""
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+
+import pytest
+
+from creality_wifi_box_client.scheduler import PollScheduler
+
+TEST_FLEET_SIZE = 100
+TEST_INTERVAL = 0.05
+TEST_RUN_TIME = 0.3
+TEST_MAX_IN_FLIGHT = 2
+TEST_BATCH_FLEET_SIZE = 10
+
+
+class PollLog:
+    """Poll function recording when each box was polled."""
+
+    def __init__(self, duration: float = 0.0) -> None:
+        """Initialize the log."""
+        self.duration = duration
+        self.polls: Counter[str] = Counter()
+        self.running: Counter[str] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_per_box = 0
+        self.started = asyncio.Event()
+
+    async def __call__(self, box: str) -> None:
+        """Poll a box."""
+        self.polls[box] += 1
+        self.running[box] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.max_per_box = max(self.max_per_box, self.running[box])
+        self.started.set()
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.in_flight -= 1
+            self.running[box] -= 1
+
+
+async def run_for(scheduler: PollScheduler, seconds: float) -> None:
+    """Run the scheduler for a while."""
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_boxes_spread_over_period() -> None:
+    """Test boxes are spread evenly across the poll period."""
+    scheduler = PollScheduler(PollLog())
+    start = time.monotonic()
+    for i in range(TEST_FLEET_SIZE):
+        scheduler.add(f"box{i}", 1.0)
+
+    phases = sorted(scheduler.next_deadline(f"box{i}") - start for i in range(TEST_FLEET_SIZE))
+    gaps = [b - a for a, b in itertools.pairwise(phases)]
+    assert len(scheduler) == TEST_FLEET_SIZE
+    assert "box0" in scheduler
+    assert phases[0] >= 0
+    assert phases[-1] < 1.0
+    assert max(gaps) < 3 / TEST_FLEET_SIZE
+
+
+@pytest.mark.asyncio
+async def test_polls_every_interval() -> None:
+    """Test every box is polled once per interval."""
+    poll = PollLog()
+    scheduler = PollScheduler(poll, jitter=0.1)
+    for box in ("a", "b", "c"):
+        scheduler.add(box, TEST_INTERVAL)
+
+    await run_for(scheduler, TEST_RUN_TIME)
+
+    expected = TEST_RUN_TIME / TEST_INTERVAL
+    for box in ("a", "b", "c"):
+        assert expected - 2 <= poll.polls[box] <= expected + 2
+    assert scheduler.stats.dispatched == sum(poll.polls.values())
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight() -> None:
+    """Test the global in-flight cap."""
+    poll = PollLog(duration=TEST_INTERVAL * 2)
+    scheduler = PollScheduler(poll, max_in_flight=TEST_MAX_IN_FLIGHT, jitter=0)
+    for i in range(5):
+        scheduler.add(f"box{i}", TEST_INTERVAL / 5)
+
+    await run_for(scheduler, TEST_RUN_TIME)
+
+    assert poll.max_in_flight == TEST_MAX_IN_FLIGHT
+
+
+@pytest.mark.asyncio
+async def test_slow_box_is_skipped() -> None:
+    """Test slots are skipped while the previous poll of a box is running."""
+    poll = PollLog(duration=TEST_INTERVAL * 3)
+    scheduler = PollScheduler(poll, jitter=0)
+    scheduler.add("slow", TEST_INTERVAL)
+
+    await run_for(scheduler, TEST_RUN_TIME)
+
+    assert poll.max_in_flight == 1
+    assert scheduler.stats.skipped > 0
+    assert poll.polls["slow"] < TEST_RUN_TIME / TEST_INTERVAL
+
+
+@pytest.mark.asyncio
+async def test_removed_box_can_be_added_again() -> None:
+    """Test queued entries of a removed box are ignored once it is added again."""
+    poll = PollLog()
+    scheduler = PollScheduler(poll, jitter=0)
+    scheduler.add("other", 10.0)
+    scheduler.add("a", 10.0)
+    scheduler.remove("a")
+    scheduler.add("a", 10.0)
+
+    await run_for(scheduler, TEST_INTERVAL)
+
+    assert poll.polls["other"] == 1
+    assert poll.polls["a"] <= 1
+
+
+@pytest.mark.asyncio
+async def test_readded_box_waits_for_running_poll() -> None:
+    """Test a box removed and added again during its poll is not polled twice at once."""
+    poll = PollLog(duration=TEST_RUN_TIME)
+    scheduler = PollScheduler(poll, jitter=0)
+    scheduler.add("a", TEST_INTERVAL)
+    task = asyncio.create_task(scheduler.run())
+    await poll.started.wait()
+
+    scheduler.remove("a")
+    scheduler.add("a", TEST_INTERVAL)
+    await asyncio.sleep(TEST_INTERVAL * 3)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert poll.polls["a"] == 1
+    assert poll.max_per_box == 1
+    assert scheduler.stats.skipped > 0
+
+
+@pytest.mark.asyncio
+async def test_batches() -> None:
+    """Test due polls are dispatched in bounded batches."""
+    poll = PollLog()
+    scheduler = PollScheduler(poll, batch_size=3, jitter=0)
+    for i in range(TEST_BATCH_FLEET_SIZE):
+        scheduler.add(f"box{i}", TEST_INTERVAL / 2)
+    # Let every box fall due before the scheduler starts.
+    await asyncio.sleep(TEST_INTERVAL)
+
+    await run_for(scheduler, 0.005)
+
+    assert scheduler.stats.dispatched >= TEST_BATCH_FLEET_SIZE
+    assert scheduler.stats.batches >= TEST_BATCH_FLEET_SIZE / 3
+
+
+@pytest.mark.asyncio
+async def test_set_interval_and_remove() -> None:
+    """Test changing the interval of a box and removing one."""
+    poll = PollLog()
+    scheduler = PollScheduler(poll, jitter=0)
+    scheduler.add("fast", 10.0)
+    scheduler.add("removed", TEST_INTERVAL)
+    scheduler.remove("removed")
+    scheduler.remove("unknown")
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(TEST_INTERVAL)
+
+    scheduler.set_interval("fast", TEST_INTERVAL)
+    await asyncio.sleep(TEST_RUN_TIME)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert poll.polls["removed"] == 0
+    assert poll.polls["fast"] >= TEST_RUN_TIME / TEST_INTERVAL - 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("interval", [0, -1.0, float("nan")])
+async def test_invalid_interval(interval: float) -> None:
+    """Test intervals that are not positive are rejected."""
+    scheduler = PollScheduler(PollLog())
+    with pytest.raises(ValueError, match="must be positive"):
+        scheduler.add("a", interval)
+    assert "a" not in scheduler
+
+    scheduler.add("a", TEST_INTERVAL)
+    with pytest.raises(ValueError, match="must be positive"):
+        scheduler.set_interval("a", interval)
+    assert scheduler.next_deadline("a") <= time.monotonic() + TEST_INTERVAL
+
+
+@pytest.mark.asyncio
+async def test_poll_errors_are_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test a failing poll does not stop the scheduler."""
+
+    async def fail(box: str) -> None:
+        msg = f"{box} is down"
+        raise RuntimeError(msg)
+
+    scheduler = PollScheduler(fail)
+    scheduler.add("a", TEST_INTERVAL)
+    await run_for(scheduler, TEST_INTERVAL * 3)
+
+    assert "Poll of a failed" in caplog.text
+    assert scheduler.stats.dispatched > 1
+
+
+@pytest.mark.asyncio
+async def test_idle_scheduler() -> None:
+    """Test a scheduler with no boxes waits for one to be added."""
+    poll = PollLog()
+    scheduler = PollScheduler(poll, jitter=0)
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.01)
+    scheduler.add("a", 10.0)
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert poll.polls["a"] == 1
@@ -0,0 +1,100 @@
+"""Tests for the persisted fleet state."""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from creality_wifi_box_client.box_info import BoxInfo
+from creality_wifi_box_client.snapshot import SECRET_FIELDS, FleetSnapshot, revalidation_delays
+
+TEST_TIMESTAMP = 1700000000.0
+TEST_WINDOW = 30.0
+
+
+def test_update(box_info: BoxInfo) -> None:
+    """Test fresh states are not stale."""
+    snapshot = FleetSnapshot()
+    snapshot.update("a:80", box_info)
+
+    state = snapshot.get("a:80")
+    assert state is not None
+    assert state.info == box_info
+    assert state.stale is False
+    assert state.timestamp > 0
+    assert snapshot.get("b:80") is None
+    assert len(snapshot) == 1
+
+
+def test_save_and_load(box_info: BoxInfo, tmp_path: Path) -> None:
+    """Test loaded states keep their data and timestamp and are stale."""
+    path = tmp_path / "fleet.json.gz"
+    snapshot = FleetSnapshot()
+    snapshot.update("a:80", box_info, TEST_TIMESTAMP)
+    snapshot.save(path)
+
+    loaded = FleetSnapshot.load(path)
+    state = loaded.get("a:80")
+    assert list(loaded) == ["a:80"]
+    assert state is not None
+    assert state.info == box_info.model_copy(update=dict.fromkeys(SECRET_FIELDS, ""))
+    assert state.timestamp == TEST_TIMESTAMP
+    assert state.stale is True
+    assert not path.with_name("fleet.json.gz.tmp").exists()
+
+
+def test_save_leaves_out_credentials(box_info: BoxInfo, tmp_path: Path) -> None:
+    """Test the credentials of a box are not written to disk."""
+    path = tmp_path / "fleet.json.gz"
+    snapshot = FleetSnapshot()
+    snapshot.update("a:80", box_info, TEST_TIMESTAMP)
+    snapshot.save(path)
+
+    with gzip.open(path, "rt") as file:
+        saved = json.load(file)["boxes"]["a:80"]["info"]
+    assert not {"wifipasswd", "APILicense", "DIDString", "InitString"} & saved.keys()
+    assert box_info.wifipasswd not in json.dumps(saved)
+
+
+def test_load_missing(tmp_path: Path) -> None:
+    """Test a missing file gives an empty snapshot."""
+    assert len(FleetSnapshot.load(tmp_path / "missing.json.gz")) == 0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"version": 99},
+        [1],
+        {"version": 1},
+        {"version": 1, "boxes": {"a:80": {"time": 0}}},
+    ],
+)
+def test_load_unsupported(tmp_path: Path, data: object) -> None:
+    """Test loading a file that is not a snapshot."""
+    path = tmp_path / "other.json.gz"
+    with gzip.open(path, "wt") as file:
+        json.dump(data, file)
+
+    with pytest.raises(ValueError, match="Unsupported snapshot"):
+        FleetSnapshot.load(path)
+
+
+def test_revalidation_delays(box_info: BoxInfo) -> None:
+    """Test unknown and stalest boxes come first, each in its own slot."""
+    snapshot = FleetSnapshot()
+    snapshot.update("new:80", box_info, TEST_TIMESTAMP + 10)
+    snapshot.update("old:80", box_info, TEST_TIMESTAMP)
+
+    delays = revalidation_delays(snapshot, ["new:80", "old:80", "unknown:80"], TEST_WINDOW)
+
+    slot = TEST_WINDOW / 3
+    assert 0 <= delays["unknown:80"] < slot
+    assert slot <= delays["old:80"] < 2 * slot
+    assert 2 * slot <= delays["new:80"] < TEST_WINDOW
+
+
+def test_revalidation_delays_empty() -> None:
+    """Test an empty fleet."""
+    assert revalidation_delays(FleetSnapshot(), [], TEST_WINDOW) == {}
@@ -0,0 +1,199 @@
+"""Tests for streaming uploads to the wifi box."""
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from creality_wifi_box_client.creality_wifi_box_client import CrealityWifiBoxClient
+from creality_wifi_box_client.exceptions import ClientConnectionError, RequestTimeoutError
+from creality_wifi_box_client.hedging import RetryPolicy
+from creality_wifi_box_client.upload import UploadOptions, upload_to_many
+
+TEST_CHUNK_SIZE = 1024
+TEST_FILE_SIZE = 4 * TEST_CHUNK_SIZE + 100
+TEST_RATE = 10 * TEST_CHUNK_SIZE
+TEST_HTTP_ERROR = 507
+TEST_FLEET_SIZE = 3
+TEST_GCODE = bytes(i % 251 for i in range(TEST_FILE_SIZE))
+
+
+class StandIn:
+    """A local stand-in for the upload endpoint of the box."""
+
+    def __init__(self) -> None:
+        """Initialize the stand-in."""
+        self.files: dict[str, bytes] = {}
+        self.content_lengths: list[int | None] = []
+        self.drop_next = 0
+        self.status = 200
+
+    async def upload(self, request: web.Request) -> web.Response:
+        """Store an uploaded file, or drop the connection halfway."""
+        self.content_lengths.append(request.content_length)
+        if self.drop_next:
+            self.drop_next -= 1
+            await request.content.read(TEST_CHUNK_SIZE)
+            request.transport.close()
+            return web.Response()
+        self.files[request.match_info["name"]] = await request.read()
+        return web.Response(status=self.status)
+
+    async def info(self, _: web.Request) -> web.Response:
+        """Answer a command while an upload is running."""
+        return web.Response(text='{"error": 0}')
+
+
+@pytest.fixture
+async def stand_in() -> AsyncGenerator[tuple[StandIn, int]]:
+    """Run the stand-in server on an ephemeral port."""
+    box = StandIn()
+    app = web.Application()
+    app.router.add_post("/upload/{name}", box.upload)
+    app.router.add_get("/protocal.csp", box.info)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    yield box, runner.addresses[0][1]
+    await runner.cleanup()
+
+
+@pytest.fixture
+def gcode(tmp_path: Path) -> Path:
+    """Create a G-code file to upload."""
+    path = tmp_path / "part.gcode"
+    path.write_bytes(TEST_GCODE)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_upload_file(stand_in: tuple[StandIn, int], gcode: Path) -> None:
+    """Test a file is streamed in chunks with progress."""
+    box, port = stand_in
+    progress: list[tuple[int, int]] = []
+
+    async with CrealityWifiBoxClient("127.0.0.1", port) as client:
+        result = await client.upload_file(
+            gcode,
+            remote_name="my part.gcode",
+            progress=lambda sent, total: progress.append((sent, total)),
+            options=UploadOptions(chunk_size=TEST_CHUNK_SIZE),
+        )
+
+    assert result is True
+    assert box.files["my part.gcode"] == TEST_GCODE
+    assert box.content_lengths == [TEST_FILE_SIZE]
+    assert [sent for sent, _ in progress] == [1024, 2048, 3072, 4096, TEST_FILE_SIZE]
+    assert {total for _, total in progress} == {TEST_FILE_SIZE}
+
+
+@pytest.mark.asyncio
+async def test_upload_bandwidth_cap(stand_in: tuple[StandIn, int], gcode: Path) -> None:
+    """Test the bandwidth cap slows the upload while commands keep working."""
+    box, port = stand_in
+    options = UploadOptions(chunk_size=TEST_CHUNK_SIZE, max_bytes_per_second=TEST_RATE)
+
+    async with CrealityWifiBoxClient("127.0.0.1", port) as client:
+        start = time.monotonic()
+        upload = asyncio.create_task(client.upload_file(gcode, options=options))
+        await asyncio.sleep(0.1)
+        assert await client.pause_print() is True
+        assert not upload.done()
+        await upload
+        elapsed = time.monotonic() - start
+
+    assert elapsed >= 4 * TEST_CHUNK_SIZE / TEST_RATE
+    assert box.files["part.gcode"] == TEST_GCODE
+
+
+@pytest.mark.asyncio
+async def test_upload_retries_after_disconnect(stand_in: tuple[StandIn, int], gcode: Path) -> None:
+    """Test a dropped upload is restarted from the beginning."""
+    box, port = stand_in
+    box.drop_next = 1
+
+    async with CrealityWifiBoxClient("127.0.0.1", port) as client:
+        result = await client.upload_file(
+            gcode,
+            options=UploadOptions(chunk_size=TEST_CHUNK_SIZE),
+            retry=RetryPolicy(retries=1, base_delay=0),
+        )
+
+    assert result is True
+    assert box.files["part.gcode"] == TEST_GCODE
+
+
+@pytest.mark.asyncio
+async def test_upload_disconnect(stand_in: tuple[StandIn, int], gcode: Path) -> None:
+    """Test a dropped upload fails cleanly without retries."""
+    box, port = stand_in
+    box.drop_next = 1
+
+    async with CrealityWifiBoxClient("127.0.0.1", port) as client:
+        with pytest.raises(ClientConnectionError, match="Failed to connect"):
+            await client.upload_file(gcode, options=UploadOptions(chunk_size=TEST_CHUNK_SIZE))
+
+    assert box.files == {}
+
+
+@pytest.mark.asyncio
+async def test_upload_http_error(stand_in: tuple[StandIn, int], gcode: Path) -> None:
+    """Test an error status from the box."""
+    box, port = stand_in
+    box.status = TEST_HTTP_ERROR
+
+    async with CrealityWifiBoxClient("127.0.0.1", port) as client:
+        with pytest.raises(ClientConnectionError, match="HTTP error for upload: 507"):
+            await client.upload_file(gcode)
+
+
+@pytest.mark.asyncio
+async def test_upload_http_error_not_retried(stand_in: tuple[StandIn, int], gcode: Path) -> None:
+    """Test an error status from the box is raised without retrying."""
+    box, port = stand_in
+    box.status = TEST_HTTP_ERROR
+
+    async with CrealityWifiBoxClient("127.0.0.1", port) as client:
+        with pytest.raises(ClientConnectionError, match="HTTP error for upload: 507"):
+            await client.upload_file(gcode, retry=RetryPolicy(retries=2, base_delay=0))
+
+    assert box.content_lengths == [TEST_FILE_SIZE]
+
+
+@pytest.mark.asyncio
+async def test_upload_timeout(gcode: Path) -> None:
+    """Test an upload the box stops reading."""
+    with patch("aiohttp.ClientSession") as mock:
+        session = MagicMock()
+        mock.return_value = session
+        session.closed = False
+        session.post.side_effect = aiohttp.ServerTimeoutError()
+        client = CrealityWifiBoxClient("127.0.0.1", 8080)
+
+        with pytest.raises(RequestTimeoutError, match="Upload to WiFi Box timed out"):
+            await client.upload_file(gcode)
+
+
+@pytest.mark.asyncio
+async def test_upload_to_many(stand_in: tuple[StandIn, int], gcode: Path, unused_tcp_port: int) -> None:
+    """Test uploading one file to a fleet reports each result."""
+    box, port = stand_in
+    clients = [
+        CrealityWifiBoxClient("127.0.0.1", port),
+        CrealityWifiBoxClient("127.0.0.1", unused_tcp_port),
+        CrealityWifiBoxClient("127.0.0.1", port),
+    ]
+
+    results = await upload_to_many(clients, gcode, concurrency=2)
+    for client in clients:
+        await client.close()
+
+    assert results[0] is True
+    assert isinstance(results[1], ClientConnectionError)
+    assert results[2] is True
+    assert len(box.content_lengths) == TEST_FLEET_SIZE - 1